@@ -5,30 +5,61 @@ Based on existing business finder patterns with optimizations
 
 import os
 import asyncio
+from collections import OrderedDict
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 import requests
+from requests.adapters import HTTPAdapter, Retry
 from googlemaps import Client
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from dotenv import load_dotenv
 import json
 import logging
 # import pandas as pd  # Removed for compatibility
 from datetime import datetime
 import concurrent.futures
+import threading
 import time
 from config import BusinessSearchParams, YELP_API_KEY, GOOGLE_API_KEY
+from category_helper import CategoryHelper
+from http_utils import TokenBucket, get_http_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 from smarty_verification import get_smarty_verifier
 
 # Load environment variables
 load_dotenv()
 
+# Shared empty-dict singleton so hot paths don't allocate a throwaway
+# {} for every business missing a "location" block
+_EMPTY = {}
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class VerifiedBusiness:
-    """Verified business data structure"""
+    """Verified business data structure.
+
+    Uses slots to avoid a per-instance __dict__ since thousands of these
+    can coexist in memory before an Excel export.
+    """
     name: str
     address: str
     phone_number: str
@@ -41,8 +72,24 @@ class BusinessFinder:
     A class to find businesses using Yelp API, cross-reference with Google API,
     optimized for speed without AI verification.
     """
-    
-    def __init__(self, 
+
+    __slots__ = (
+        'yelp_api_key', 'google_client', 'yelp_base_url', 'session',
+        'google_cache', 'google_cache_max_size', 'google_cache_hits',
+        'google_cache_misses', 'google_api_calls', 'category_helper',
+        'start_time', '_yelp_bucket'
+    )
+
+    # Yelp's documented QPS cap; the bucket throttles the concurrent
+    # page fetches to it client-side so the retry policy stays a backstop
+    YELP_QPS = 5
+
+    # How long a None ("not found") Google result stays cached. Successful
+    # lookups are kept until evicted; failures get a short TTL so transient
+    # outages don't poison the cache for the life of the worker.
+    NEGATIVE_CACHE_TTL = 300.0
+
+    def __init__(self,
                  yelp_api_key: str = None,
                  google_api_key: str = None):
         """
@@ -57,93 +104,248 @@ class BusinessFinder:
         
         # API endpoints
         self.yelp_base_url = "https://api.yelp.com/v3"
-        
-        # Cache for Google API calls
-        self.google_cache = {}
+
+        # Pooled HTTP session so paginated Yelp calls reuse keep-alive
+        # connections instead of paying a TLS handshake per request
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.yelp_api_key}",
+            "Content-Type": "application/json"
+        })
+        # GET-only retries with Retry-After honoured, so 429s back off
+        # for exactly as long as Yelp asks instead of a blind sleep
+        retries = Retry(total=5, backoff_factor=0.2,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=('GET',),
+                        respect_retry_after_header=True)
+        self.session.mount("https://", HTTPAdapter(pool_connections=50,
+                                                   pool_maxsize=50,
+                                                   max_retries=retries))
+
+        # Bounded LRU cache for Google API calls: keeps hot entries
+        # resident while capping memory on long-running workers
+        self.google_cache = OrderedDict()
+        self.google_cache_max_size = 10_000
+        self.google_cache_hits = 0
+        self.google_cache_misses = 0
         self.google_api_calls = 0
         
+        self._yelp_bucket = TokenBucket(rate=self.YELP_QPS,
+                                        capacity=self.YELP_QPS)
+
+        # Category lookups (indexes are shared at class level, so this is cheap)
+        self.category_helper = CategoryHelper()
+
         # Performance tracking
         self.start_time = None
-        self.api_call_times = []
     
-    def search_yelp_businesses(self, params: BusinessSearchParams) -> List[Dict]:
+    def search_yelp_businesses(self, params: BusinessSearchParams,
+                               bypass_cache: bool = False) -> List[Dict]:
         """
         Search for businesses on Yelp based on given parameters.
         Optimized to minimize API calls by using pagination efficiently.
-        
+
         Args:
             params: BusinessSearchParams object with search criteria
-            
+            bypass_cache: Skip the on-disk response cache and force
+                fresh API calls (responses still refresh the cache)
+
         Returns:
             List of business dictionaries from Yelp
         """
-        headers = {
-            "Authorization": f"Bearer {self.yelp_api_key}",
-            "Content-Type": "application/json"
-        }
-        
+        # Nothing requested: bail out before limit/offset math, which
+        # would divide the page range by a zero limit
+        if params.max_results <= 0:
+            return []
+
         # Convert miles to meters for Yelp API
         radius_meters = int(params.distance_miles * 1609.34)
-        
-        all_businesses = []
-        offset = 0
+
+        # Prefer Yelp's indexed `categories` filter over full-text `term`
+        # search: it is faster server-side and more relevant, so fewer
+        # pages are needed to reach max_results
+        category_alias = self.category_helper.get_category_alias(params.industry)
+
+        url = f"{self.yelp_base_url}/businesses/search"
         limit = min(50, params.max_results)  # Yelp max is 50 per request
-        
-        while len(all_businesses) < params.max_results:
-            url = f"{self.yelp_base_url}/businesses/search"
-            params_dict = {
-                "term": params.industry,
-                "location": params.city,
-                "radius": radius_meters,
-                "limit": limit,
-                "offset": offset,
-                "sort_by": "rating"  # Sort by rating
-            }
-            
+        offsets = list(range(0, params.max_results, limit))
+
+        def fetch_page(offset: int) -> List[Dict]:
+            params_dict = self._search_page_params(params, radius_meters,
+                                                   category_alias, limit, offset)
+            cache = get_http_cache()
+            cache_key = cache.key(url, params_dict)
+            if not bypass_cache:
+                body = cache.get(cache_key)
+                if body is not None:
+                    data = orjson.loads(body) if orjson is not None else json.loads(body)
+                    return data.get("businesses", [])
+
             try:
-                response = requests.get(url, headers=headers, params=params_dict)
+                self._yelp_bucket.acquire()
+                response = self.session.get(url, params=params_dict)
                 response.raise_for_status()
-                
-                data = response.json()
-                businesses = data.get("businesses", [])
-                
-                if not businesses:
-                    break  # No more results
-                
-                all_businesses.extend(businesses)
-                offset += len(businesses)
-                
-                # If we got fewer results than requested, we've reached the end
-                if len(businesses) < limit:
-                    break
-                    
+
+                if orjson is not None:
+                    data = orjson.loads(response.content)
+                else:
+                    data = response.json()
+                cache.put(cache_key, response.content)
+                return data.get("businesses", [])
             except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching Yelp data: {e}")
-                break
-        
+                logger.error("Error fetching Yelp data: %s", e)
+                return []
+
+        # Fetch all needed pages concurrently instead of paying a full
+        # round-trip per sequential offset. A short final page means
+        # end-of-results; the slight over-fetch of later (empty) pages is
+        # worth the latency cut.
+        if len(offsets) == 1:
+            pages = [fetch_page(offsets[0])]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(8, len(offsets))) as executor:
+                pages = list(executor.map(fetch_page, offsets))
+
+        all_businesses = []
+        for offset, businesses in zip(offsets, pages):
+            all_businesses.extend(businesses)
+            if len(businesses) < min(limit, params.max_results - offset):
+                break  # No more results after this page
+
         # Limit to requested number of results
         all_businesses = all_businesses[:params.max_results]
-        logger.info(f"Found {len(all_businesses)} businesses on Yelp (used {offset//limit + 1} API calls)")
+        logger.info("Found %d businesses on Yelp (used %d API calls)", len(all_businesses), len(offsets))
         return all_businesses
-    
+
+    @staticmethod
+    def _search_page_params(params: BusinessSearchParams, radius_meters: int,
+                            category_alias: Optional[str], limit: int,
+                            offset: int) -> Dict:
+        """Query params for one search page (shared by sync/async paths)."""
+        params_dict = {
+            "location": params.city,
+            "radius": radius_meters,
+            "limit": min(limit, params.max_results - offset),
+            "offset": offset,
+            "sort_by": "rating"  # Sort by rating
+        }
+        if category_alias:
+            params_dict["categories"] = category_alias
+        else:
+            params_dict["term"] = params.industry
+        return params_dict
+
+    async def search_yelp_businesses_async(self, params: BusinessSearchParams,
+                                           bypass_cache: bool = False) -> List[Dict]:
+        """
+        Async variant of search_yelp_businesses for callers already on an
+        event loop running many searches at once.
+
+        With aiohttp installed, all page offsets fetch as coroutines on
+        one connection pool (DNS cached, concurrency gated to the QPS
+        cap) — hundreds of in-flight searches cost one thread. Without
+        it, the sync path runs on a worker thread so the loop never
+        blocks.
+
+        Args:
+            params: BusinessSearchParams object with search criteria
+            bypass_cache: Skip the on-disk response cache
+
+        Returns:
+            List of business dictionaries from Yelp
+        """
+        if aiohttp is None:
+            return await asyncio.to_thread(self.search_yelp_businesses,
+                                           params, bypass_cache)
+
+        # Same zero-limit guard as the sync path
+        if params.max_results <= 0:
+            return []
+
+        radius_meters = int(params.distance_miles * 1609.34)
+        category_alias = self.category_helper.get_category_alias(params.industry)
+        url = f"{self.yelp_base_url}/businesses/search"
+        limit = min(50, params.max_results)
+        offsets = list(range(0, params.max_results, limit))
+        cache = get_http_cache()
+        semaphore = asyncio.Semaphore(self.YELP_QPS)
+
+        async with aiohttp.ClientSession(
+                headers={"Authorization": f"Bearer {self.yelp_api_key}"},
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+        ) as session:
+
+            async def fetch_page(offset: int) -> List[Dict]:
+                params_dict = self._search_page_params(params, radius_meters,
+                                                       category_alias, limit,
+                                                       offset)
+                cache_key = cache.key(url, params_dict)
+                if not bypass_cache:
+                    body = cache.get(cache_key)
+                    if body is not None:
+                        data = orjson.loads(body) if orjson is not None else json.loads(body)
+                        return data.get("businesses", [])
+
+                try:
+                    async with semaphore:
+                        async with session.get(url, params=params_dict) as response:
+                            response.raise_for_status()
+                            body = await response.read()
+                except aiohttp.ClientError as e:
+                    logger.error("Error fetching Yelp data: %s", e)
+                    return []
+
+                data = orjson.loads(body) if orjson is not None else json.loads(body)
+                cache.put(cache_key, body)
+                return data.get("businesses", [])
+
+            pages = await asyncio.gather(*(fetch_page(offset)
+                                           for offset in offsets))
+
+        all_businesses = []
+        for offset, businesses in zip(offsets, pages):
+            all_businesses.extend(businesses)
+            if len(businesses) < min(limit, params.max_results - offset):
+                break  # No more results after this page
+
+        all_businesses = all_businesses[:params.max_results]
+        logger.info("Found %d businesses on Yelp (used %d API calls)",
+                    len(all_businesses), len(offsets))
+        return all_businesses
+
+    @staticmethod
+    def _google_cache_key(business_name: str, address: str) -> str:
+        """Build the cache key for a Google Places lookup."""
+        return f"{business_name.lower()}_{address.lower()}"
+
     def get_google_business_info(self, business_name: str, address: str) -> Optional[Dict]:
         """
         Get business information from Google Places API with caching.
-        
+
         Args:
             business_name: Name of the business
             address: Address of the business
-            
+
         Returns:
             Google business data or None if not found
         """
         # Create cache key
-        cache_key = f"{business_name.lower()}_{address.lower()}"
-        
+        cache_key = self._google_cache_key(business_name, address)
+
         # Check cache first
-        if cache_key in self.google_cache:
-            return self.google_cache[cache_key]
-        
+        entry = self.google_cache.get(cache_key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self.google_cache_hits += 1
+                self.google_cache.move_to_end(cache_key)
+                return value
+            # Expired negative entry: drop it and re-query
+            del self.google_cache[cache_key]
+
+        self.google_cache_misses += 1
+
         try:
             # Search for the business
             search_query = f"{business_name} {address}"
@@ -166,17 +368,29 @@ class BusinessFinder:
                 result = details_result.get("result", {})
                 
                 # Cache the result
-                self.google_cache[cache_key] = result
+                self._google_cache_put(cache_key, result)
                 return result
-            
+
             # Cache None result to avoid repeated failed searches
-            self.google_cache[cache_key] = None
+            self._google_cache_put(cache_key, None)
             return None
-            
+
         except Exception as e:
-            logger.error(f"Error getting Google data for {business_name}: {e}")
-            self.google_cache[cache_key] = None
+            logger.error("Error getting Google data for %s: %s", business_name, e)
+            self._google_cache_put(cache_key, None)
             return None
+
+    def _google_cache_put(self, cache_key: str, value: Optional[Dict]):
+        """Insert into the Google cache, evicting the oldest entry when full.
+
+        Entries are (value, expires_at) tuples; None values expire after
+        NEGATIVE_CACHE_TTL seconds so misses can be retried.
+        """
+        expires_at = None if value is not None else time.monotonic() + self.NEGATIVE_CACHE_TTL
+        self.google_cache[cache_key] = (value, expires_at)
+        self.google_cache.move_to_end(cache_key)
+        while len(self.google_cache) > self.google_cache_max_size:
+            self.google_cache.popitem(last=False)
     
     def fast_verify_business(self, yelp_data: Dict, google_data: Optional[Dict]) -> Dict:
         """
@@ -191,10 +405,11 @@ class BusinessFinder:
             Dictionary with verified business information
         """
         # Extract Yelp info
+        location = yelp_data.get("location") or _EMPTY
         yelp_info = {
             "name": yelp_data.get("name"),
-            "address": yelp_data.get("location", {}).get("address1"),
-            "city": yelp_data.get("location", {}).get("city"),
+            "address": location.get("address1"),
+            "city": location.get("city"),
             "phone": yelp_data.get("phone"),
             "rating": yelp_data.get("rating"),
             "review_count": yelp_data.get("review_count")
@@ -230,33 +445,68 @@ class BusinessFinder:
     def process_business_batch(self, yelp_businesses: List[Dict]) -> List[VerifiedBusiness]:
         """
         Process a batch of businesses in parallel for maximum speed.
-        
+
         Args:
             yelp_businesses: List of Yelp business data
-            
+
+        Returns:
+            List of verified business objects
+        """
+        return asyncio.run(self.process_business_batch_async(yelp_businesses))
+
+    async def process_business_batch_async(self, yelp_businesses: List[Dict]) -> List[VerifiedBusiness]:
+        """
+        Async orchestrator for batch processing.
+
+        Fans all businesses out through asyncio.gather with a semaphore
+        capping in-flight work at 20, instead of a fixed 10-thread pool.
+        The blocking Google/requests calls run in the default executor.
+
+        Args:
+            yelp_businesses: List of Yelp business data
+
         Returns:
             List of verified business objects
         """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(20)
+
+        # Deduplicate Google lookups up front: duplicate names/addresses
+        # across Yelp pages would otherwise trigger repeated places()+place()
+        # call pairs. Warm the cache once per unique key, then fan out
+        # verification against the populated cache.
+        unique_lookups = {}
+        for yelp_business in yelp_businesses:
+            name = yelp_business.get("name", "")
+            address = (yelp_business.get("location") or _EMPTY).get("address1", "")
+            cache_key = self._google_cache_key(name, address)
+            if cache_key not in self.google_cache and cache_key not in unique_lookups:
+                unique_lookups[cache_key] = (name, address)
+
+        async def warm_one(name: str, address: str):
+            async with semaphore:
+                await loop.run_in_executor(
+                    None, self.get_google_business_info, name, address)
+
+        await asyncio.gather(
+            *(warm_one(name, address) for name, address in unique_lookups.values()),
+            return_exceptions=True)
+
+        async def process_one(yelp_business: Dict) -> Optional[VerifiedBusiness]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None, self._process_single_business, yelp_business)
+
+        tasks = [process_one(b) for b in yelp_businesses]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
         verified_businesses = []
-        
-        # Process businesses in parallel using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit all tasks
-            future_to_business = {}
-            for yelp_business in yelp_businesses:
-                future = executor.submit(self._process_single_business, yelp_business)
-                future_to_business[future] = yelp_business
-            
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_business):
-                try:
-                    business = future.result()
-                    if business:
-                        verified_businesses.append(business)
-                except Exception as e:
-                    yelp_business = future_to_business[future]
-                    logger.error(f"Error processing business {yelp_business.get('name', 'Unknown')}: {e}")
-        
+        for yelp_business, result in zip(yelp_businesses, results):
+            if isinstance(result, Exception):
+                logger.error("Error processing business %s: %s", yelp_business.get('name', 'Unknown'), result)
+            elif result:
+                verified_businesses.append(result)
+
         return verified_businesses
     
     def _process_single_business(self, yelp_business: Dict) -> Optional[VerifiedBusiness]:
@@ -271,7 +521,8 @@ class BusinessFinder:
         """
         try:
             # Get Google data for cross-referencing
-            yelp_address = yelp_business.get("location", {}).get("address1", "")
+            location = yelp_business.get("location") or _EMPTY
+            yelp_address = location.get("address1", "")
             google_data = self.get_google_business_info(
                 yelp_business.get("name", ""),
                 yelp_address
@@ -303,7 +554,7 @@ class BusinessFinder:
             return business
             
         except Exception as e:
-            logger.error(f"Error processing business {yelp_business.get('name', 'Unknown')}: {e}")
+            logger.error("Error processing business %s: %s", yelp_business.get('name', 'Unknown'), e)
             return None
     
     def find_and_export_businesses(self, params: BusinessSearchParams, 
@@ -320,10 +571,12 @@ class BusinessFinder:
             Path to the created Excel file
         """
         self.start_time = time.time()
-        logger.info(f"Starting fast business search for {params.industry} in {params.city}")
+        logger.info("Starting fast business search for %s in %s", params.industry, params.city)
         
         # Reset counters
         self.google_api_calls = 0
+        self.google_cache_hits = 0
+        self.google_cache_misses = 0
         self.google_cache.clear()
         
         # Step 1: Get businesses from Yelp
@@ -334,7 +587,7 @@ class BusinessFinder:
             return ""
         
         # Step 2: Process businesses in parallel
-        logger.info(f"Processing {len(yelp_businesses)} businesses in parallel...")
+        logger.info("Processing %d businesses in parallel...", len(yelp_businesses))
         verified_businesses = self.process_business_batch(yelp_businesses)
         
         # Step 3: Export to Excel immediately
@@ -342,14 +595,33 @@ class BusinessFinder:
         
         # Log performance metrics
         total_time = time.time() - self.start_time
-        logger.info(f"Completed in {total_time:.2f} seconds")
-        logger.info(f"Processed {len(verified_businesses)} businesses")
-        logger.info(f"Total Google API calls: {self.google_api_calls}")
-        logger.info(f"Average time per business: {total_time/len(verified_businesses):.2f} seconds")
+        logger.info("Completed in %.2f seconds", total_time)
+        logger.info("Processed %d businesses", len(verified_businesses))
+        logger.info("Total Google API calls: %d", self.google_api_calls)
+        logger.info("Average time per business: %.2f seconds", total_time / len(verified_businesses))
         
         return excel_file
     
-    def export_to_excel(self, businesses: List[VerifiedBusiness], params: BusinessSearchParams, 
+    @staticmethod
+    def _export_row(business: VerifiedBusiness) -> Tuple:
+        """Build the spreadsheet row tuple for one verified business."""
+        metadata = business.verification_metadata or _EMPTY
+        return (
+            business.name,
+            business.address,
+            business.city,
+            business.phone_number,
+            business.source,
+            metadata.get("confidence_level", "unknown"),
+            metadata.get("business_status", "unknown"),
+            metadata.get("yelp_rating", "N/A"),
+            metadata.get("yelp_review_count", "N/A"),
+            metadata.get("discrepancies_found", False),
+            metadata.get("discrepancy_details", ""),
+            metadata.get("reasoning", ""),
+        )
+
+    def export_to_excel(self, businesses: List[VerifiedBusiness], params: BusinessSearchParams,
                        filename: Optional[str] = None) -> str:
         """
         Export business results to an Excel file with comprehensive information.
@@ -373,52 +645,14 @@ class BusinessFinder:
             safe_industry = params.industry.replace(" ", "_")
             filename = f"businesses_{safe_industry}_{safe_city}_{timestamp}.xlsx"
         
-        # Prepare data for Excel
-        excel_data = []
-        
-        for business in businesses:
-            metadata = business.verification_metadata or {}
-            
-            row = {
-                "Business Name": business.name,
-                "Address": business.address,
-                "City": business.city,
-                "Phone Number": business.phone_number,
-                "Source": business.source,
-                "Confidence Level": metadata.get("confidence_level", "unknown"),
-                "Business Status": metadata.get("business_status", "unknown"),
-                "Yelp Rating": metadata.get("yelp_rating", "N/A"),
-                "Yelp Review Count": metadata.get("yelp_review_count", "N/A"),
-                "Discrepancies Found": metadata.get("discrepancies_found", False),
-                "Discrepancy Details": metadata.get("discrepancy_details", ""),
-                "Verification Reasoning": metadata.get("reasoning", ""),
-            }
-            excel_data.append(row)
-        
-        # Create Excel file using openpyxl directly
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Business Data"
-        
-        # Add headers
-        headers = list(excel_data[0].keys()) if excel_data else []
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-        
-        # Add data
-        for row, business in enumerate(excel_data, 2):
-            for col, (key, value) in enumerate(business.items(), 1):
-                ws.cell(row=row, column=col, value=value)
-        
-        # Create summary sheet
-        ws_summary = wb.create_sheet("Summary")
-        ws_summary.cell(row=1, column=1, value="Metric")
-        ws_summary.cell(row=1, column=2, value="Value")
-        
+        headers = (
+            "Business Name", "Address", "City", "Phone Number", "Source",
+            "Confidence Level", "Business Status", "Yelp Rating",
+            "Yelp Review Count", "Discrepancies Found", "Discrepancy Details",
+            "Verification Reasoning"
+        )
+
+        stats = self.get_api_usage_stats()
         summary_data = [
             ("Total Businesses Found", len(businesses)),
             ("Search City", params.city),
@@ -427,19 +661,52 @@ class BusinessFinder:
             ("Max Results Requested", params.max_results),
             ("Search Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
             ("Total Google API Calls", self.google_api_calls),
-            ("Google Cache Hits", self.get_api_usage_stats()["google_cache_hits"]),
-            ("Google Cache Misses", self.get_api_usage_stats()["google_cache_misses"])
+            ("Google Cache Hits", stats["google_cache_hits"]),
+            ("Google Cache Misses", stats["google_cache_misses"])
         ]
-        
-        for row, (metric, value) in enumerate(summary_data, 2):
-            ws_summary.cell(row=row, column=1, value=metric)
-            ws_summary.cell(row=row, column=2, value=value)
-        
-        # Save the workbook
-        wb.save(filename)
-        
-        logger.info(f"Excel file created: {filename}")
-        logger.info(f"Exported {len(businesses)} businesses to {filename}")
+
+        if xlsxwriter is not None:
+            # xlsxwriter's constant_memory mode frees each row as soon as
+            # it is written, so memory stays flat regardless of row count
+            wb = xlsxwriter.Workbook(filename, {"constant_memory": True,
+                                                "strings_to_numbers": False})
+            ws = wb.add_worksheet("Business Data")
+            bold = wb.add_format({"bold": True})
+            ws.write_row(0, 0, headers, bold)
+            for row_idx, business in enumerate(businesses, 1):
+                ws.write_row(row_idx, 0, self._export_row(business))
+
+            ws_summary = wb.add_worksheet("Summary")
+            ws_summary.write_row(0, 0, ("Metric", "Value"))
+            for row_idx, pair in enumerate(summary_data, 1):
+                ws_summary.write_row(row_idx, 0, pair)
+            wb.close()
+        else:
+            # Fall back to openpyxl in write-only mode: rows are streamed
+            # to disk instead of keeping a Cell object per value
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Business Data")
+
+            header_font = Font(bold=True)
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = header_font
+                header_cells.append(cell)
+            ws.append(header_cells)
+
+            for business in businesses:
+                ws.append(self._export_row(business))
+
+            ws_summary = wb.create_sheet("Summary")
+            ws_summary.append(["Metric", "Value"])
+            for metric, value in summary_data:
+                ws_summary.append([metric, value])
+
+            wb.save(filename)
+
+        logger.info("Excel file created: %s", filename)
+        logger.info("Exported %d businesses to %s", len(businesses), filename)
         
         return filename
     
@@ -453,8 +720,8 @@ class BusinessFinder:
         return {
             "google_api_calls": self.google_api_calls,
             "google_cache_size": len(self.google_cache),
-            "google_cache_hits": len([v for v in self.google_cache.values() if v is not None]),
-            "google_cache_misses": len([v for v in self.google_cache.values() if v is None])
+            "google_cache_hits": self.google_cache_hits,
+            "google_cache_misses": self.google_cache_misses
         }
     
     def clear_google_cache(self):
@@ -508,7 +775,7 @@ class BusinessFinder:
         zip_code = location.get('zip_code', '')
         
         if not all([street, city, state, zip_code]):
-            logger.warning(f"Incomplete address for business {business.get('name', 'Unknown')}")
+            logger.warning("Incomplete address for business %s", business.get('name', 'Unknown'))
             return business
         
         # Verify the address
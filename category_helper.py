@@ -3,16 +3,46 @@ Category Helper for Lead Generator
 Based on existing category helper patterns
 """
 
+import bisect
 import json
+import pickle
+import sys
 from typing import List, Dict, Optional
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class CategoryHelper:
     """
     Helper class to manage Yelp categories and provide category search functionality.
     """
-    
+
+    __slots__ = (
+        'categories_file', 'categories', 'title_to_alias', 'alias_to_title',
+        'alias_to_cat', 'title_to_cat', '_resolve_index', '_search_entries',
+        '_sorted_titles', 'parent_categories'
+    )
+
+    # Parsed categories and built indexes shared across instances, keyed
+    # by file path, so per-request construction (e.g. in Flask views)
+    # doesn't reparse the JSON or rebuild the dicts
+    _CACHE = {}
+    _INDEX_ATTRS = (
+        "categories", "title_to_alias", "alias_to_title", "alias_to_cat",
+        "title_to_cat", "_resolve_index", "_search_entries",
+        "_sorted_titles", "parent_categories"
+    )
+
+    _POPULAR_ALIASES = (
+        "restaurants", "food", "shopping", "health", "auto",
+        "beautysvc", "homeservices", "professional", "active",
+        "arts", "education", "financialservices", "hotelstravel"
+    )
+
     def __init__(self, categories_file: str = "yelp_categories.json"):
         """
         Initialize the CategoryHelper with Yelp categories.
@@ -21,27 +51,80 @@ class CategoryHelper:
             categories_file: Path to the JSON file containing Yelp categories
         """
         self.categories_file = categories_file
-        self.categories = self._load_categories()
-        self._build_search_index()
+        cached = self._CACHE.get(categories_file)
+        if cached is None:
+            cached = self._load_index_cache()
+            if cached is None:
+                self.categories = self._load_categories()
+                self._build_search_index()
+                cached = {name: getattr(self, name) for name in self._INDEX_ATTRS}
+                self._save_index_cache(cached)
+            self._CACHE[categories_file] = cached
+        for name, value in cached.items():
+            setattr(self, name, value)
     
     def _load_categories(self) -> List[Dict]:
         """Load categories from JSON file."""
         try:
-            with open(self.categories_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.categories_file, 'rb') as f:
+                data = f.read()
+            # orjson parses noticeably faster than stdlib json when available
+            if orjson is not None:
+                return orjson.loads(data)
+            return json.loads(data)
         except FileNotFoundError:
             print(f"Warning: {self.categories_file} not found. Using empty categories list.")
             return []
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"Error parsing {self.categories_file}: {e}")
             return []
     
+    def _index_cache_path(self) -> Path:
+        """Path of the pickled index cache kept next to the JSON file."""
+        return Path(self.categories_file).with_suffix(".pkl")
+
+    def _load_index_cache(self) -> Optional[Dict]:
+        """Load prebuilt indexes from pickle if still newer than the JSON."""
+        cache_path = self._index_cache_path()
+        try:
+            if cache_path.stat().st_mtime < Path(self.categories_file).stat().st_mtime:
+                return None
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError):
+            return None
+        # Reject stale caches written by an older index layout
+        if set(cached) != set(self._INDEX_ATTRS):
+            return None
+        return cached
+
+    def _save_index_cache(self, cached: Dict):
+        """Persist built indexes so the next cold start skips parse+build."""
+        try:
+            with open(self._index_cache_path(), 'wb') as f:
+                pickle.dump(cached, f, protocol=5)
+        except OSError:
+            pass
+
     def _build_search_index(self):
         """Build search index for faster category lookups."""
         self.title_to_alias = {cat["title"].lower(): cat["alias"] for cat in self.categories}
         self.alias_to_title = {cat["alias"]: cat["title"] for cat in self.categories}
+        self.alias_to_cat = {cat["alias"]: cat for cat in self.categories}
+        self.title_to_cat = {cat["title"].lower(): cat for cat in self.categories}
+        # Combined alias+title index so resolve() answers either form of
+        # user input with one dict lookup; titles win on collision,
+        # matching the title-first check in validate_category
+        self._resolve_index = {**self.alias_to_cat, **self.title_to_cat}
+        # Lowercased (title, alias, category) tuples so search_categories
+        # doesn't re-lower every entry per query, plus a sorted title list
+        # for bisect-based prefix matching
+        self._search_entries = [(cat["title"].lower(), cat["alias"].lower(), cat)
+                                for cat in self.categories]
+        self._sorted_titles = sorted((cat["title"].lower(), cat["alias"])
+                                     for cat in self.categories)
         self.parent_categories = {}
-        
+
         for cat in self.categories:
             for parent in cat.get("parent_aliases", []):
                 if parent not in self.parent_categories:
@@ -61,21 +144,28 @@ class CategoryHelper:
         """
         query_lower = query.lower()
         matches = []
-        
-        for cat in self.categories:
-            title_lower = cat["title"].lower()
-            alias_lower = cat["alias"].lower()
-            
-            # Check if query matches title or alias
-            if (query_lower in title_lower or 
-                query_lower in alias_lower or
-                title_lower.startswith(query_lower) or
-                alias_lower.startswith(query_lower)):
+        seen = set()
+
+        # Title prefix hits first, found with a single bisect into the
+        # sorted lowercase title list
+        start = bisect.bisect_left(self._sorted_titles, (query_lower,))
+        for title, alias in self._sorted_titles[start:]:
+            if not title.startswith(query_lower):
+                break
+            matches.append(self.alias_to_cat[alias])
+            seen.add(alias)
+            if len(matches) >= limit:
+                return matches
+
+        # Then substring hits on title or alias for the remainder
+        for title_lower, alias_lower, cat in self._search_entries:
+            if cat["alias"] in seen:
+                continue
+            if query_lower in title_lower or query_lower in alias_lower:
                 matches.append(cat)
-                
                 if len(matches) >= limit:
                     break
-        
+
         return matches
     
     def get_category_by_alias(self, alias: str) -> Optional[Dict]:
@@ -88,10 +178,7 @@ class CategoryHelper:
         Returns:
             Category dictionary or None if not found
         """
-        for cat in self.categories:
-            if cat["alias"] == alias:
-                return cat
-        return None
+        return self.alias_to_cat.get(alias)
     
     def get_category_by_title(self, title: str) -> Optional[Dict]:
         """
@@ -103,10 +190,7 @@ class CategoryHelper:
         Returns:
             Category dictionary or None if not found
         """
-        for cat in self.categories:
-            if cat["title"].lower() == title.lower():
-                return cat
-        return None
+        return self.title_to_cat.get(title.lower())
     
     def get_subcategories(self, parent_alias: str) -> List[Dict]:
         """
@@ -118,11 +202,8 @@ class CategoryHelper:
         Returns:
             List of subcategory dictionaries
         """
-        subcategories = []
-        for cat in self.categories:
-            if parent_alias in cat.get("parent_aliases", []):
-                subcategories.append(cat)
-        return subcategories
+        return [self.alias_to_cat[alias]
+                for alias in self.parent_categories.get(parent_alias, [])]
     
     def get_parent_categories(self) -> List[Dict]:
         """
@@ -140,20 +221,22 @@ class CategoryHelper:
         Returns:
             List of popular category dictionaries
         """
-        popular_aliases = [
-            "restaurants", "food", "shopping", "health", "auto", 
-            "beautysvc", "homeservices", "professional", "active",
-            "arts", "education", "financialservices", "hotelstravel"
-        ]
-        
-        popular_categories = []
-        for alias in popular_aliases:
-            cat = self.get_category_by_alias(alias)
-            if cat:
-                popular_categories.append(cat)
-        
-        return popular_categories
+        return [self.alias_to_cat[alias] for alias in self._POPULAR_ALIASES
+                if alias in self.alias_to_cat]
     
+    def resolve(self, category: str) -> Optional[Dict]:
+        """
+        Resolve a category title or alias to its category dict.
+
+        Args:
+            category: Category title or alias, any case
+
+        Returns:
+            Category dictionary or None if not found
+        """
+        return (self._resolve_index.get(category) or
+                self._resolve_index.get(category.lower()))
+
     def validate_category(self, category: str) -> bool:
         """
         Validate if a category exists (by title or alias).
@@ -164,8 +247,8 @@ class CategoryHelper:
         Returns:
             True if category exists, False otherwise
         """
-        return (self.get_category_by_title(category) is not None or 
-                self.get_category_by_alias(category) is not None)
+        return (category.lower() in self.title_to_cat or
+                category in self.alias_to_cat)
     
     def get_category_alias(self, category: str) -> Optional[str]:
         """
@@ -198,14 +281,19 @@ class CategoryHelper:
             indent: Indentation level
         """
         if parent_alias is None:
-            # Print root categories
-            root_categories = self.get_parent_categories()
-            for cat in root_categories:
-                print(" " * indent + f"• {cat['title']} ({cat['alias']})")
-                self.print_category_tree(cat['alias'], indent + 2)
+            start_categories = self.get_parent_categories()
         else:
-            # Print subcategories
-            subcategories = self.get_subcategories(parent_alias)
-            for cat in subcategories:
-                print(" " * indent + f"• {cat['title']} ({cat['alias']})")
-                self.print_category_tree(cat['alias'], indent + 2)
+            start_categories = self.get_subcategories(parent_alias)
+
+        # Walk the tree iteratively and emit the whole listing with a
+        # single write instead of one locked/flushed print per node
+        lines = []
+        stack = [(cat, indent) for cat in reversed(start_categories)]
+        while stack:
+            cat, cat_indent = stack.pop()
+            lines.append(" " * cat_indent + f"• {cat['title']} ({cat['alias']})")
+            children = self.get_subcategories(cat['alias'])
+            stack.extend((child, cat_indent + 2) for child in reversed(children))
+
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
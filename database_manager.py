@@ -3,25 +3,190 @@ Database Manager for Lead Generator
 Handles SQLite database operations
 """
 
+import atexit
 import sqlite3
 import os
+import threading
 import uuid
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import Dict, Iterator, List, Optional
 from config import DATABASE_URL, UPLOAD_FOLDER
 
+# Column key tuples for row-to-dict conversion: dict(zip(keys, row)) runs
+# at the C level instead of a 10+-entry dict literal per row
+_BUSINESS_KEYS = (
+    'businessid', 'yelp_id', 'name', 'address', 'city', 'state', 'zip_code',
+    'phone', 'website', 'business_type', 'rating', 'review_count',
+    'price_level', 'yelp_url'
+)
+_LEAD_KEYS = (
+    'leadid', 'business_id', 'user_id', 'status', 'notes', 'created',
+    'business_name', 'business_address', 'business_phone', 'business_website'
+)
+
+# Hot-path SQL is kept in stable module-level strings (one variant per
+# filter combination for get_businesses) so sqlite3's per-connection
+# statement cache reuses the prepared statements instead of re-parsing.
+# Location matching is a prefix LIKE ('x%', bound with COLLATE NOCASE)
+# rather than a substring '%x%': a prefix pattern lets SQLite seek the
+# NOCASE indexes on city/address instead of scanning every row
+_WHERE_VARIANTS = {
+    (False, False): "1=1",
+    (True, False): "(city LIKE ? COLLATE NOCASE OR address LIKE ? COLLATE NOCASE)",
+    (False, True): "business_type = ?",
+    (True, True): "(city LIKE ? COLLATE NOCASE OR address LIKE ? COLLATE NOCASE) AND business_type = ?",
+}
+_SQL_LIST_BUSINESSES = {key: f"""
+    SELECT businessid, yelp_id, name, address, city, state, zip_code,
+           phone, website, business_type, rating, review_count, price_level, yelp_url,
+           COUNT(*) OVER () AS total
+    FROM businesses
+    WHERE {where}
+    ORDER BY created DESC
+    LIMIT ? OFFSET ?
+""" for key, where in _WHERE_VARIANTS.items()}
+_SQL_COUNT_BUSINESSES = {key: f"SELECT COUNT(*) FROM businesses WHERE {where}"
+                         for key, where in _WHERE_VARIANTS.items()}
+_SQL_ITER_BUSINESSES = {key: f"""
+    SELECT name, address, city, state, zip_code, phone, website,
+           business_type, rating, review_count, price_level, yelp_url
+    FROM businesses
+    WHERE {where}
+    ORDER BY created DESC
+""" for key, where in _WHERE_VARIANTS.items()}
+_SQL_GET_BUSINESS = """
+    SELECT businessid, yelp_id, name, address, city, state, zip_code,
+           phone, website, business_type, rating, review_count, price_level, yelp_url
+    FROM businesses
+    WHERE businessid = ?
+"""
+_SQL_CREATE_LEAD = """
+    INSERT INTO leads (business_id, user_id, notes)
+    VALUES (?, ?, ?)
+"""
+_SQL_LIST_LEADS = """
+    SELECT l.leadid, l.business_id, l.user_id, l.status, l.notes, l.created,
+           b.name, b.address, b.phone, b.website,
+           COUNT(*) OVER () AS total
+    FROM leads l
+    JOIN businesses b ON l.business_id = b.businessid
+    ORDER BY l.created DESC
+    LIMIT ? OFFSET ?
+"""
+_SQL_COUNT_LEADS = "SELECT COUNT(*) FROM leads"
+# Keyset variants: seeking on the leadid PK is O(size) at any depth,
+# where OFFSET has to scan and discard every earlier row
+_SQL_LIST_LEADS_KEYSET = """
+    SELECT l.leadid, l.business_id, l.user_id, l.status, l.notes, l.created,
+           b.name, b.address, b.phone, b.website
+    FROM leads l
+    JOIN businesses b ON l.business_id = b.businessid
+    ORDER BY l.leadid DESC
+    LIMIT ?
+"""
+_SQL_LIST_LEADS_KEYSET_AFTER = """
+    SELECT l.leadid, l.business_id, l.user_id, l.status, l.notes, l.created,
+           b.name, b.address, b.phone, b.website
+    FROM leads l
+    JOIN businesses b ON l.business_id = b.businessid
+    WHERE l.leadid < ?
+    ORDER BY l.leadid DESC
+    LIMIT ?
+"""
+_SQL_INSERT_BUSINESS = """
+    INSERT OR IGNORE INTO businesses
+    (yelp_id, name, address, city, state, zip_code, phone, website,
+     business_type, rating, review_count, price_level, yelp_url)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_UPSERT_KEYS = (
+    'yelp_id', 'name', 'address', 'city', 'state', 'zip_code', 'phone',
+    'website', 'business_type', 'rating', 'review_count', 'price_level',
+    'yelp_url'
+)
+_UPSERT_ROW_PLACEHOLDER = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_SQL_UPSERT_PREFIX = """
+    INSERT INTO businesses (yelp_id, name, address, city, state, zip_code,
+                            phone, website, business_type, rating,
+                            review_count, price_level, yelp_url)
+    VALUES """
+_SQL_UPSERT_SUFFIX = """
+    ON CONFLICT(yelp_id) DO UPDATE SET
+        name=excluded.name, address=excluded.address, city=excluded.city,
+        state=excluded.state, zip_code=excluded.zip_code,
+        phone=excluded.phone, website=excluded.website,
+        business_type=excluded.business_type, rating=excluded.rating,
+        review_count=excluded.review_count,
+        price_level=excluded.price_level, yelp_url=excluded.yelp_url
+"""
+_SQL_UPSERT_BUSINESS = _SQL_UPSERT_PREFIX + _UPSERT_ROW_PLACEHOLDER + _SQL_UPSERT_SUFFIX
+# Rows per multi-VALUES upsert statement, capped by SQLite's classic
+# 999-parameter limit at 13 columns per row
+_UPSERT_CHUNK_ROWS = 999 // len(_UPSERT_KEYS)
+
 class DatabaseManager:
     def __init__(self, db_path: str = DATABASE_URL):
         self.db_path = db_path
+        # file: URIs pass through sqlite3's URI handling, so test and
+        # sample workloads can point DATABASE_URL at
+        # 'file::memory:?cache=shared' and run entirely in RAM with all
+        # connections sharing pages — no fsync, no page-cache reloads
+        self._uri = db_path.startswith('file:')
+        # One long-lived connection per thread: sqlite3 connections are
+        # not thread-safe, but reopening per call discards the page cache
+        self._local = threading.local()
         self.ensure_db_directory()
-    
+        atexit.register(self.close)
+
     def ensure_db_directory(self):
         """Ensure database directory exists"""
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-    
+        if self._uri:
+            # URI databases (typically in-memory) have no directory to
+            # create and nothing to gain from WAL
+            return
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # WAL is persistent per database file, so one connection sets it
+        # for good: readers stop blocking writers and writes fsync less.
+        # sqlite3's context manager only scopes a transaction, so close
+        # the bootstrap connection explicitly
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied"""
+        conn = sqlite3.connect(self.db_path, uri=self._uri)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        return conn
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Return this thread's long-lived connection, creating it lazily.
+
+        Use as `with db_manager.get_connection() as conn:` — the context
+        manager scopes a transaction without closing the connection.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close the current thread's connection if one is open"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def create_tables(self):
         """Create Lead Generator database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Users table
@@ -98,19 +263,52 @@ class DatabaseManager:
                     FOREIGN KEY (user_id) REFERENCES users(userid)
                 )
             """)
-            
+
+            # Indexes for the hot list queries: business_type equality
+            # filters and created DESC ordering would otherwise full-scan
+            # and sort on every paginated request
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_businesses_type_created
+                ON businesses(business_type, created DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_businesses_created
+                ON businesses(created DESC)
+            """)
+            # Composite on (created DESC, business_id) makes the paginated
+            # leads query an index-range scan that also carries the join
+            # key, so each page row goes straight to the businesses PK
+            # lookup without touching the leads table
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_leads_created_biz
+                ON leads(created DESC, business_id)
+            """)
+            # NOCASE-collated indexes let the prefix-LIKE location filter
+            # seek instead of full-scanning
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_businesses_city_nocase
+                ON businesses(city COLLATE NOCASE)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_businesses_address_nocase
+                ON businesses(address COLLATE NOCASE)
+            """)
+
             conn.commit()
-    
+
     def reset_database(self):
         """Reset database with sample data"""
-        if os.path.exists(self.db_path):
+        self.close()
+        # An in-memory database vanishes with its last connection, so
+        # only on-disk files need removing
+        if not self._uri and os.path.exists(self.db_path):
             os.remove(self.db_path)
         self.create_tables()
         self.add_sample_data()
     
     def add_sample_data(self):
         """Add sample data for testing"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             
             # Add sample users
@@ -132,13 +330,9 @@ class DatabaseManager:
                  'https://yelp.com/biz/sample-beauty')
             ]
             
-            for business in sample_businesses:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO businesses 
-                    (yelp_id, name, address, city, state, zip_code, phone, website, 
-                     business_type, rating, review_count, price_level, yelp_url)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, business)
+            # One executemany over the shared insert statement instead of
+            # a statement (and potential fsync) per row
+            cursor.executemany(_SQL_INSERT_BUSINESS, sample_businesses)
             
             # Add sample leads
             cursor.execute("""
@@ -151,57 +345,42 @@ class DatabaseManager:
     def get_businesses(self, page: int = 1, size: int = 10, location: str = '', 
                      business_type: str = '') -> Dict:
         """Get businesses with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            # Build WHERE clause
-            where_conditions = []
+            # Pick the prebuilt SQL variant for this filter combination
+            variant = (bool(location), bool(business_type))
             params = []
-            
             if location:
-                where_conditions.append("(city LIKE ? OR address LIKE ?)")
-                params.extend([f'%{location}%', f'%{location}%'])
-            
+                params.extend([f'{location}%', f'{location}%'])
             if business_type:
-                where_conditions.append("business_type = ?")
                 params.append(business_type)
-            
-            where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-            
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM businesses WHERE {where_clause}", params)
-            total = cursor.fetchone()[0]
-            
-            # Get businesses with pagination
+
+            # Page and total in one windowed query instead of running the
+            # same WHERE clause twice (COUNT then page)
             offset = (page - 1) * size
-            cursor.execute(f"""
-                SELECT businessid, yelp_id, name, address, city, state, zip_code, 
-                       phone, website, business_type, rating, review_count, price_level, yelp_url
-                FROM businesses 
-                WHERE {where_clause}
-                ORDER BY created DESC
-                LIMIT ? OFFSET ?
-            """, params + [size, offset])
-            
+            cursor.arraysize = size
+            cursor.execute(_SQL_LIST_BUSINESSES[variant], params + [size, offset])
+
+            # Stream rows off the cursor instead of materializing a raw
+            # tuple list first; zip stops at the key tuple, so the
+            # trailing window-total column is dropped automatically
+            total = None
             businesses = []
-            for row in cursor.fetchall():
-                businesses.append({
-                    'businessid': row[0],
-                    'yelp_id': row[1],
-                    'name': row[2],
-                    'address': row[3],
-                    'city': row[4],
-                    'state': row[5],
-                    'zip_code': row[6],
-                    'phone': row[7],
-                    'website': row[8],
-                    'business_type': row[9],
-                    'rating': row[10],
-                    'review_count': row[11],
-                    'price_level': row[12],
-                    'yelp_url': row[13]
-                })
-            
+            for row in cursor:
+                if total is None:
+                    total = row[14]
+                businesses.append(dict(zip(_BUSINESS_KEYS, row)))
+
+            if total is None:
+                if offset:
+                    # Page past the end: fall back to a count so callers
+                    # still see the real total
+                    cursor.execute(_SQL_COUNT_BUSINESSES[variant], params)
+                    total = cursor.fetchone()[0]
+                else:
+                    total = 0
+
             # Calculate pagination info
             total_pages = (total + size - 1) // size
             next_page = page + 1 if page < total_pages else None
@@ -215,83 +394,126 @@ class DatabaseManager:
                 'next_page': next_page
             }
     
+    def bulk_insert_businesses(self, rows: List[tuple]) -> int:
+        """Bulk-insert business rows, skipping yelp_ids already stored.
+
+        Rows are value tuples in _SQL_INSERT_BUSINESS column order. The
+        single executemany in one transaction reuses the same prepared
+        statement as add_sample_data, so importer-scale batches avoid a
+        parse and fsync per row.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_SQL_INSERT_BUSINESS, rows)
+            return cursor.rowcount
+
+    def upsert_businesses(self, businesses: List[Dict]) -> int:
+        """Insert or refresh business rows keyed on yelp_id.
+
+        One executemany in a single transaction; repeated searches update
+        the stored rows in place so the DB-backed list endpoints serve
+        them without another API call.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                _SQL_UPSERT_BUSINESS,
+                ([b.get(key) for key in _UPSERT_KEYS] for b in businesses)
+            )
+            return cursor.rowcount
+
+    def bulk_upsert_businesses(self, rows: List[tuple]) -> int:
+        """Upsert importer-scale batches with multi-row VALUES statements.
+
+        Rows are value tuples in _UPSERT_KEYS column order. Each statement
+        carries _UPSERT_CHUNK_ROWS rows of placeholders, so a batch costs
+        one round trip per ~76 rows instead of one per row, and all full
+        chunks share the same SQL string for the statement cache. The
+        whole batch commits as a single transaction.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            inserted = 0
+            for start in range(0, len(rows), _UPSERT_CHUNK_ROWS):
+                chunk = rows[start:start + _UPSERT_CHUNK_ROWS]
+                sql = (_SQL_UPSERT_PREFIX
+                       + ",".join([_UPSERT_ROW_PLACEHOLDER] * len(chunk))
+                       + _SQL_UPSERT_SUFFIX)
+                cursor.execute(sql, list(chain.from_iterable(chunk)))
+                inserted += cursor.rowcount
+            return inserted
+
+    def iter_businesses(self, location: str = '', business_type: str = '') -> Iterator[tuple]:
+        """Yield business rows as raw tuples in Excel export column order.
+
+        Streams straight off the cursor with no dict conversion, so large
+        exports hold one row in memory at a time instead of the whole
+        result set.
+        """
+        cursor = self.get_connection().cursor()
+
+        variant = (bool(location), bool(business_type))
+        params = []
+        if location:
+            params.extend([f'{location}%', f'{location}%'])
+        if business_type:
+            params.append(business_type)
+
+        cursor.arraysize = 100
+        cursor.execute(_SQL_ITER_BUSINESSES[variant], params)
+        yield from cursor
+
     def get_business(self, business_id: int) -> Optional[Dict]:
         """Get specific business by ID"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT businessid, yelp_id, name, address, city, state, zip_code, 
-                       phone, website, business_type, rating, review_count, price_level, yelp_url
-                FROM businesses 
-                WHERE businessid = ?
-            """, (business_id,))
+            cursor.execute(_SQL_GET_BUSINESS, (business_id,))
             
             row = cursor.fetchone()
             if not row:
                 return None
-            
-            return {
-                'businessid': row[0],
-                'yelp_id': row[1],
-                'name': row[2],
-                'address': row[3],
-                'city': row[4],
-                'state': row[5],
-                'zip_code': row[6],
-                'phone': row[7],
-                'website': row[8],
-                'business_type': row[9],
-                'rating': row[10],
-                'review_count': row[11],
-                'price_level': row[12],
-                'yelp_url': row[13]
-            }
+
+            return dict(zip(_BUSINESS_KEYS, row))
     
     def create_lead(self, business_id: int, user_id: int, notes: str = '') -> int:
         """Create a new lead"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO leads (business_id, user_id, notes)
-                VALUES (?, ?, ?)
-            """, (business_id, user_id, notes))
+            cursor.execute(_SQL_CREATE_LEAD, (business_id, user_id, notes))
             return cursor.lastrowid
     
-    def get_leads(self, page: int = 1, size: int = 10) -> Dict:
-        """Get leads with pagination"""
-        with sqlite3.connect(self.db_path) as conn:
+    def get_leads(self, page: int = 1, size: int = 10,
+                  after: Optional[int] = None) -> Dict:
+        """Get leads with pagination.
+
+        When ``after`` is given, pages by keyset (leadid < after) — an
+        index seek that stays O(size) at any depth. The page/size form
+        is kept as a shim for existing UI callers.
+        """
+        if after is not None:
+            return self._get_leads_keyset(size, after)
+        with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Get total count
-            cursor.execute("SELECT COUNT(*) FROM leads")
-            total = cursor.fetchone()[0]
-            
-            # Get leads with pagination
+
+            # Page and total in one windowed query, mirroring get_businesses
             offset = (page - 1) * size
-            cursor.execute("""
-                SELECT l.leadid, l.business_id, l.user_id, l.status, l.notes, l.created,
-                       b.name, b.address, b.phone, b.website
-                FROM leads l
-                JOIN businesses b ON l.business_id = b.businessid
-                ORDER BY l.created DESC
-                LIMIT ? OFFSET ?
-            """, (size, offset))
-            
+            cursor.arraysize = size
+            cursor.execute(_SQL_LIST_LEADS, (size, offset))
+
+            total = None
             leads = []
-            for row in cursor.fetchall():
-                leads.append({
-                    'leadid': row[0],
-                    'business_id': row[1],
-                    'user_id': row[2],
-                    'status': row[3],
-                    'notes': row[4],
-                    'created': row[5],
-                    'business_name': row[6],
-                    'business_address': row[7],
-                    'business_phone': row[8],
-                    'business_website': row[9]
-                })
-            
+            for row in cursor:
+                if total is None:
+                    total = row[10]
+                leads.append(dict(zip(_LEAD_KEYS, row)))
+
+            if total is None:
+                if offset:
+                    cursor.execute(_SQL_COUNT_LEADS)
+                    total = cursor.fetchone()[0]
+                else:
+                    total = 0
+
             # Calculate pagination info
             total_pages = (total + size - 1) // size
             next_page = page + 1 if page < total_pages else None
@@ -304,3 +526,26 @@ class DatabaseManager:
                 'total_pages': total_pages,
                 'next_page': next_page
             }
+
+    def _get_leads_keyset(self, size: int, after: int) -> Dict:
+        """Keyset page of leads; ``after=0`` starts from the newest."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = size
+            if after > 0:
+                cursor.execute(_SQL_LIST_LEADS_KEYSET_AFTER, (after, size))
+            else:
+                cursor.execute(_SQL_LIST_LEADS_KEYSET, (size,))
+
+            leads = [dict(zip(_LEAD_KEYS, row)) for row in cursor]
+
+            # A short page means the scan is exhausted; otherwise the
+            # last leadid is the cursor for the next page
+            next_after = leads[-1]['leadid'] if len(leads) == size else None
+
+            return {
+                'results': leads,
+                'size': size,
+                'after': after,
+                'next_after': next_after
+            }
@@ -4,199 +4,306 @@ Handles Excel export functionality
 """
 
 import os
+import uuid
+from collections import Counter
 from typing import List, Dict
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from config import EXCEL_COLUMNS, OUTPUT_FOLDER
 
+try:
+    # xlsxwriter's constant_memory mode streams each finished row to the
+    # zip stream, keeping memory flat for very large exports
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# Dict keys for a business row, in export column order
+_BUSINESS_KEYS = (
+    'name', 'address', 'city', 'state', 'zip_code', 'phone', 'website',
+    'business_type', 'rating', 'review_count', 'price_level', 'yelp_url'
+)
+# Column widths in the same order
+_COLUMN_WIDTHS = (25, 35, 15, 10, 10, 15, 30, 20, 10, 15, 10, 30)
+
+# Lead export layout
+_LEAD_KEYS = (
+    'leadid', 'business_name', 'business_address', 'business_phone',
+    'business_website', 'status', 'notes', 'created'
+)
+_LEAD_HEADERS = (
+    'Lead ID', 'Business Name', 'Address', 'Phone', 'Website',
+    'Status', 'Notes', 'Created Date'
+)
+_LEAD_COLUMN_WIDTHS = (15, 25, 35, 15, 30, 15, 30, 20)
+
 class ExcelGenerator:
+    # Style singletons shared across exports: openpyxl style objects are
+    # immutable, so building them once instead of per call keeps them out
+    # of the hot path
+    _HEADER_FONT = Font(bold=True, color="FFFFFF")
+    _HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    _HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+    _BOLD_FONT = Font(bold=True)
+
     def __init__(self):
-        self.output_folder = OUTPUT_FOLDER
+        # Absolute so stored filepaths stay valid regardless of the
+        # server's working directory (send_file resolves relative paths
+        # against the app root, not the CWD)
+        self.output_folder = os.path.abspath(OUTPUT_FOLDER)
         self.ensure_output_directory()
     
     def ensure_output_directory(self):
         """Ensure output directory exists"""
         os.makedirs(self.output_folder, exist_ok=True)
     
-    def export_to_excel(self, businesses: List[Dict], filename: str = None) -> str:
-        """Export businesses to Excel file"""
-        if not filename:
-            filename = f"business_leads_{len(businesses)}_records.xlsx"
-        
-        # Ensure .xlsx extension
-        if not filename.endswith('.xlsx'):
+    def export_to_excel(self, businesses, filename: str = None) -> str:
+        """Export businesses to Excel file.
+
+        Accepts any iterable of row dicts or tuples — e.g. a list from
+        `get_businesses` or the streaming cursor from
+        `DatabaseManager.iter_businesses` — so large exports never hold
+        the full result set in memory. Uses xlsxwriter in constant_memory
+        mode when installed; otherwise falls back to an openpyxl
+        write-only workbook.
+        """
+        if filename and not filename.endswith('.xlsx'):
             filename += '.xlsx'
-        
-        filepath = os.path.join(self.output_folder, filename)
-        
-        # Create workbook
-        wb = Workbook()
-        
+
+        if xlsxwriter is not None:
+            return self._export_with_xlsxwriter(businesses, filename)
+
+        # Write-only workbook streams rows out as they are appended instead
+        # of materializing a Cell object per value
+        wb = Workbook(write_only=True)
+
         # Create main sheet
-        ws = wb.active
-        ws.title = "Business Leads"
-        
+        ws = wb.create_sheet("Business Leads")
+
         # Add headers
         self._add_headers(ws)
-        
-        # Add data
-        self._add_business_data(ws, businesses)
-        
+
+        # Add data, accumulating summary stats in the same pass
+        stats = self._add_business_data(ws, businesses)
+
         # Create summary sheet
-        self._create_summary_sheet(wb, businesses)
-        
+        self._create_summary_sheet(wb, stats)
+
+        # The default filename needs the row count, which is only known
+        # after the write pass when businesses is a generator
+        if not filename:
+            filename = f"business_leads_{stats['total']}_records.xlsx"
+
+        filepath = os.path.join(self.output_folder, filename)
+
         # Save workbook
         wb.save(filepath)
-        
+
         return filepath
-    
+
+    def _export_with_xlsxwriter(self, businesses, filename) -> str:
+        """Stream businesses to disk with xlsxwriter in constant_memory
+        mode.
+
+        Rows must be written strictly top to bottom, so the summary sheet
+        is written after the data pass from the accumulated stats. The
+        workbook path is needed up front, so when no filename was given
+        it is written under a scratch name and renamed once the row count
+        is known.
+        """
+        scratch = os.path.join(self.output_folder, f".{uuid.uuid4().hex}.xlsx")
+        wb = xlsxwriter.Workbook(scratch, {'constant_memory': True})
+        try:
+            ws = wb.add_worksheet("Business Leads")
+            header_fmt = wb.add_format({
+                'bold': True, 'font_color': 'white', 'bg_color': '#366092',
+                'align': 'center', 'valign': 'vcenter'
+            })
+            for col, width in enumerate(_COLUMN_WIDTHS):
+                ws.set_column(col, col, width)
+            ws.write_row(0, 0, EXCEL_COLUMNS, header_fmt)
+
+            stats = self._new_stats()
+            row_idx = 1
+            for business in businesses:
+                row = self._normalize_row(business)
+                ws.write_row(row_idx, 0, row)
+                self._update_stats(stats, row)
+                row_idx += 1
+
+            summary = wb.add_worksheet("Summary")
+            bold = wb.add_format({'bold': True})
+            summary.set_column(0, 0, 25)
+            summary.set_column(1, 1, 20)
+            for row_idx, (metric, value) in enumerate(self._summary_rows(stats)):
+                summary.write(row_idx, 0, metric, bold)
+                summary.write(row_idx, 1, value)
+        finally:
+            wb.close()
+
+        if not filename:
+            filename = f"business_leads_{stats['total']}_records.xlsx"
+        filepath = os.path.join(self.output_folder, filename)
+        os.replace(scratch, filepath)
+        return filepath
+
     def _add_headers(self, ws):
         """Add headers to worksheet"""
-        headers = EXCEL_COLUMNS
-        
-        # Style for headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Set column widths
-        column_widths = {
-            'A': 25,  # Business Name
-            'B': 35,  # Address
-            'C': 15,  # City
-            'D': 10,  # State
-            'E': 10,  # ZIP Code
-            'F': 15,  # Phone Number
-            'G': 30,  # Website URL
-            'H': 20,  # Business Type
-            'I': 10,  # Rating
-            'J': 15,  # Review Count
-            'K': 10,  # Price Level
-            'L': 30   # Yelp URL
+        # Set column widths (must precede the first append in write-only mode)
+        for col, width in enumerate(_COLUMN_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(col)].width = width
+
+        ws.append([self._header_cell(ws, header) for header in EXCEL_COLUMNS])
+
+    def _header_cell(self, ws, header: str) -> WriteOnlyCell:
+        """Build one styled header cell for a write-only sheet."""
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = self._HEADER_FONT
+        cell.fill = self._HEADER_FILL
+        cell.alignment = self._HEADER_ALIGN
+        return cell
+
+    @staticmethod
+    def _normalize_row(business):
+        """Return a business as a value list in export column order.
+
+        Rows may be dicts keyed like `get_businesses` results or tuples
+        already in column order (`iter_businesses`).
+        """
+        if isinstance(business, dict):
+            return [business.get(key, '') for key in _BUSINESS_KEYS]
+        return business
+
+    @staticmethod
+    def _new_stats() -> Dict:
+        """Fresh accumulator dict for the summary statistics."""
+        return {
+            'total': 0,
+            'rating_sum': 0.0,
+            'with_phone': 0,
+            'with_website': 0,
+            'business_types': Counter(),
+            'cities': Counter(),
         }
-        
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
-    
-    def _add_business_data(self, ws, businesses: List[Dict]):
-        """Add business data to worksheet"""
-        for row, business in enumerate(businesses, 2):
-            ws.cell(row=row, column=1, value=business.get('name', ''))
-            ws.cell(row=row, column=2, value=business.get('address', ''))
-            ws.cell(row=row, column=3, value=business.get('city', ''))
-            ws.cell(row=row, column=4, value=business.get('state', ''))
-            ws.cell(row=row, column=5, value=business.get('zip_code', ''))
-            ws.cell(row=row, column=6, value=business.get('phone', ''))
-            ws.cell(row=row, column=7, value=business.get('website', ''))
-            ws.cell(row=row, column=8, value=business.get('business_type', ''))
-            ws.cell(row=row, column=9, value=business.get('rating', ''))
-            ws.cell(row=row, column=10, value=business.get('review_count', ''))
-            ws.cell(row=row, column=11, value=business.get('price_level', ''))
-            ws.cell(row=row, column=12, value=business.get('yelp_url', ''))
-    
-    def _create_summary_sheet(self, wb, businesses: List[Dict]):
-        """Create summary statistics sheet"""
-        ws = wb.create_sheet("Summary")
-        
-        # Summary statistics
-        total_businesses = len(businesses)
-        avg_rating = sum(b.get('rating', 0) for b in businesses) / total_businesses if total_businesses > 0 else 0
-        businesses_with_phone = sum(1 for b in businesses if b.get('phone'))
-        businesses_with_website = sum(1 for b in businesses if b.get('website'))
-        
-        # Business type distribution
-        business_types = {}
-        for business in businesses:
-            biz_type = business.get('business_type', 'Unknown')
-            business_types[biz_type] = business_types.get(biz_type, 0) + 1
-        
-        top_business_type = max(business_types.items(), key=lambda x: x[1]) if business_types else ('Unknown', 0)
-        
-        # City distribution
-        cities = {}
-        for business in businesses:
-            city = business.get('city', 'Unknown')
-            cities[city] = cities.get(city, 0) + 1
-        
-        top_city = max(cities.items(), key=lambda x: x[1]) if cities else ('Unknown', 0)
-        
-        # Add summary data
+
+    @staticmethod
+    def _update_stats(stats: Dict, row):
+        """Fold one normalized row into the summary accumulators.
+
+        Positions follow _BUSINESS_KEYS: city=2, phone=5, website=6,
+        business_type=7, rating=8.
+        """
+        stats['total'] += 1
+        stats['rating_sum'] += row[8] or 0
+        if row[5]:
+            stats['with_phone'] += 1
+        if row[6]:
+            stats['with_website'] += 1
+        stats['business_types'][row[7] or 'Unknown'] += 1
+        stats['cities'][row[2] or 'Unknown'] += 1
+
+    @staticmethod
+    def _summary_rows(stats: Dict) -> List[list]:
+        """Build the (metric, value) rows for the Summary sheet."""
+        total_businesses = stats['total']
+        business_types = stats['business_types']
+
+        avg_rating = stats['rating_sum'] / total_businesses if total_businesses > 0 else 0
+        top_business_type = business_types.most_common(1)[0] if business_types else ('Unknown', 0)
+        top_city = stats['cities'].most_common(1)[0] if stats['cities'] else ('Unknown', 0)
+
         summary_data = [
             ["Metric", "Value"],
             ["Total Businesses", total_businesses],
             ["Average Rating", round(avg_rating, 2)],
-            ["Businesses with Phone", businesses_with_phone],
-            ["Businesses with Website", businesses_with_website],
+            ["Businesses with Phone", stats['with_phone']],
+            ["Businesses with Website", stats['with_website']],
             ["Top Business Type", f"{top_business_type[0]} ({top_business_type[1]})"],
             ["Top City", f"{top_city[0]} ({top_city[1]})"],
             ["", ""],
             ["Business Type Distribution", ""],
         ]
-        
+
         # Add business type distribution
-        for biz_type, count in sorted(business_types.items(), key=lambda x: x[1], reverse=True):
+        for biz_type, count in business_types.most_common():
             summary_data.append([biz_type, count])
-        
-        # Add data to worksheet
-        for row, (metric, value) in enumerate(summary_data, 1):
-            ws.cell(row=row, column=1, value=metric)
-            ws.cell(row=row, column=2, value=value)
-        
-        # Style the summary sheet
-        header_font = Font(bold=True)
-        for row in range(1, len(summary_data) + 1):
-            ws.cell(row=row, column=1).font = header_font
-        
+
+        return summary_data
+
+    def _add_business_data(self, ws, businesses) -> Dict:
+        """Add business data to worksheet and return summary statistics.
+
+        The summary accumulators update in the same single pass as the
+        writes.
+        """
+        stats = self._new_stats()
+        for business in businesses:
+            row = self._normalize_row(business)
+            ws.append(row)
+            self._update_stats(stats, row)
+        return stats
+
+    def _create_summary_sheet(self, wb, stats: Dict):
+        """Create summary statistics sheet from stats gathered during the
+        data write pass"""
+        ws = wb.create_sheet("Summary")
+
         # Set column widths
         ws.column_dimensions['A'].width = 25
         ws.column_dimensions['B'].width = 20
+
+        # Add data to worksheet, bolding the metric column
+        for metric, value in self._summary_rows(stats):
+            metric_cell = WriteOnlyCell(ws, value=metric)
+            metric_cell.font = self._BOLD_FONT
+            ws.append([metric_cell, value])
     
-    def export_leads_to_excel(self, leads: List[Dict], filename: str = None) -> str:
-        """Export leads to Excel file"""
-        if not filename:
-            filename = f"leads_export_{len(leads)}_records.xlsx"
-        
+    def export_to_excel_streaming(self, row_iter, headers, filename: str,
+                                  sheet_title: str = "Export",
+                                  column_widths=None) -> str:
+        """Stream arbitrary row tuples into a write-only workbook.
+
+        Each row is appended as it is produced, so memory stays flat no
+        matter how many rows the iterator yields — pair with a streaming
+        source like SQLAlchemy's yield_per or a raw cursor.
+        """
         if not filename.endswith('.xlsx'):
             filename += '.xlsx'
-        
         filepath = os.path.join(self.output_folder, filename)
-        
-        # Create workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Leads Export"
-        
-        # Add headers
-        lead_headers = [
-            'Lead ID', 'Business Name', 'Address', 'Phone', 'Website',
-            'Status', 'Notes', 'Created Date'
-        ]
-        
-        for col, header in enumerate(lead_headers, 1):
-            ws.cell(row=1, column=col, value=header)
-        
-        # Add data
-        for row, lead in enumerate(leads, 2):
-            ws.cell(row=row, column=1, value=lead.get('leadid', ''))
-            ws.cell(row=row, column=2, value=lead.get('business_name', ''))
-            ws.cell(row=row, column=3, value=lead.get('business_address', ''))
-            ws.cell(row=row, column=4, value=lead.get('business_phone', ''))
-            ws.cell(row=row, column=5, value=lead.get('business_website', ''))
-            ws.cell(row=row, column=6, value=lead.get('status', ''))
-            ws.cell(row=row, column=7, value=lead.get('notes', ''))
-            ws.cell(row=row, column=8, value=lead.get('created', ''))
-        
-        # Set column widths
-        column_widths = [15, 25, 35, 15, 30, 15, 30, 20]
-        for col, width in enumerate(column_widths, 1):
-            ws.column_dimensions[get_column_letter(col)].width = width
-        
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(sheet_title)
+
+        if column_widths:
+            for col, width in enumerate(column_widths, 1):
+                ws.column_dimensions[get_column_letter(col)].width = width
+
+        ws.append([self._header_cell(ws, header) for header in headers])
+        for row in row_iter:
+            ws.append(row)
+
         wb.save(filepath)
         return filepath
+
+    def export_leads_to_excel(self, leads, filename: str = None) -> str:
+        """Export leads to Excel file.
+
+        Accepts dicts keyed like _LEAD_KEYS or tuples already in column
+        order, streamed through the write-only path.
+        """
+        if isinstance(leads, list) and not filename:
+            filename = f"leads_export_{len(leads)}_records.xlsx"
+        elif not filename:
+            filename = "leads_export.xlsx"
+
+        rows = (
+            [lead.get(key, '') for key in _LEAD_KEYS] if isinstance(lead, dict) else lead
+            for lead in leads
+        )
+        return self.export_to_excel_streaming(
+            rows, _LEAD_HEADERS, filename,
+            sheet_title="Leads Export",
+            column_widths=_LEAD_COLUMN_WIDTHS
+        )
@@ -0,0 +1,107 @@
+"""
+Shared HTTP client support for Lead Generator
+Rate limiting and response caching used by the Yelp API clients
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class HttpCache:
+    """SQLite-backed response cache keyed on hashed request params.
+
+    Identical Yelp queries (same location, category, offset) re-run
+    within the TTL are served from disk instead of re-spending a paid
+    API call; the cache survives process restarts, unlike the
+    in-process dicts used elsewhere.
+    """
+
+    TTL = 7 * 86400  # one week
+
+    __slots__ = ('_conn', '_lock')
+
+    def __init__(self, path: str = 'var/http_cache.sqlite3'):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # One shared connection guarded by a lock: the page fetches run
+        # on worker threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS http_cache '
+            '(key TEXT PRIMARY KEY, body BLOB, expires REAL)'
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, params: Dict) -> str:
+        """Stable digest of endpoint + sorted query params."""
+        raw = f"{endpoint}|{json.dumps(params, sort_keys=True)}"
+        return hashlib.blake2b(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for key, or None if absent/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body FROM http_cache WHERE key = ? AND expires > ?',
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, body: bytes):
+        """Store a response body under key with a fresh expiry."""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO http_cache (key, body, expires) '
+                'VALUES (?, ?, ?)',
+                (key, body, time.time() + self.TTL)
+            )
+            self._conn.commit()
+
+
+_HTTP_CACHE = None
+
+
+def get_http_cache() -> HttpCache:
+    """Shared lazily-created cache (one DB handle per process)."""
+    global _HTTP_CACHE
+    if _HTTP_CACHE is None:
+        _HTTP_CACHE = HttpCache()
+    return _HTTP_CACHE
+
+
+class TokenBucket:
+    """Thread-safe token bucket for client-side rate limiting.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    acquire() blocks until one is available. Unlike a fixed sleep per
+    request, concurrent callers only wait when the bucket is actually
+    empty, so bursts under the cap go through at full speed.
+    """
+
+    __slots__ = ('rate', 'capacity', '_tokens', '_last', '_lock')
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
@@ -2,14 +2,60 @@
 Lead Generator Flask Application
 """
 
-from flask import Flask
+from flask import Flask, request
 from flask_sqlalchemy import SQLAlchemy
 from config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
 
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """JSON provider backed by orjson's C encoder.
+
+        jsonify call sites are unchanged; they dispatch through this
+        provider, which serializes straight to bytes instead of running
+        json.dumps in pure Python. datetimes encode natively as ISO 8601,
+        so handlers can pass them through without .isoformat() calls.
+        """
+
+        def dumps(self, obj, **kwargs):
+            # decode() keeps the str return type Flask expects (session
+            # cookie signing among others relies on it)
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+else:
+    from datetime import date, datetime
+
+    from flask.json.provider import DefaultJSONProvider
+
+    class IsoDatetimeProvider(DefaultJSONProvider):
+        """Stdlib fallback that matches orjson's ISO 8601 datetimes.
+
+        Flask's default provider emits RFC 1123 dates; overriding keeps
+        the wire format identical whether or not orjson is installed.
+        """
+
+        @staticmethod
+        def default(o):
+            if isinstance(o, (datetime, date)):
+                return o.isoformat()
+            return DefaultJSONProvider.default(o)
+
+    app.json = IsoDatetimeProvider(app)
+
 # Ensure database directory exists
 import os
 os.makedirs('var', exist_ok=True)
@@ -17,6 +63,52 @@ os.makedirs('var', exist_ok=True)
 # Initialize database
 db = SQLAlchemy(app)
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+@event.listens_for(Engine, 'connect')
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Enforce foreign keys on every pooled SQLite connection.
+
+    SQLite ships with foreign_keys off; enabling it lets endpoints rely
+    on the constraint (IntegrityError) instead of a pre-check SELECT.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+if Compress is not None:
+    # Flask-Compress negotiates brotli/gzip per request and honours the
+    # COMPRESS_* settings from Config
+    Compress(app)
+else:
+    import gzip
+
+    @app.after_request
+    def _gzip_response(response):
+        """Gzip large JSON responses when the stdlib is all we have.
+
+        Streamed responses pass through untouched: compressing them
+        would require buffering the whole body.
+        """
+        if (response.direct_passthrough
+                or response.mimetype not in app.config['COMPRESS_MIMETYPES']
+                or response.content_length is None
+                or response.content_length < app.config['COMPRESS_MIN_SIZE']
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.accept_encodings):
+            return response
+        response.set_data(gzip.compress(response.get_data(),
+                                        app.config['COMPRESS_LEVEL']))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers.add('Vary', 'Accept-Encoding')
+        return response
+
 # Import routes
 from leadgen.views import dashboard, auth
 
@@ -33,4 +125,6 @@ def index():
     return redirect(url_for('dashboard.main_dashboard'))
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # threaded=True lets slow handlers (export generation, downloads)
+    # overlap instead of serializing every request on one worker
+    app.run(debug=True, threaded=True)
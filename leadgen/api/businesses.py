@@ -2,14 +2,32 @@
 Businesses API endpoints
 """
 
+from functools import lru_cache
+
 from flask import Blueprint, jsonify, request
 from leadgen import db
-from leadgen.model import Business
 from database_manager import DatabaseManager
 
 api = Blueprint('businesses', __name__)
 db_manager = DatabaseManager()
 
+
+@lru_cache(maxsize=512)
+def _yelp_search(location, business_type, radius_m, max_results):
+    """Cached Yelp lookup keyed on the exact query parameters.
+
+    A repeat of an identical search returns instantly instead of holding
+    a worker for seconds on the external API. Returns a tuple so the
+    cached value is immutable.
+    """
+    from yelp_api_client import YelpAPIClient
+    return tuple(YelpAPIClient().search_businesses(
+        location=location,
+        business_type=business_type,
+        radius=radius_m,
+        max_results=max_results
+    ))
+
 @api.route('/')
 def get_businesses_list():
     """Get list of businesses with pagination"""
@@ -20,21 +38,16 @@ def get_businesses_list():
     
     try:
         businesses = db_manager.get_businesses(
-            page=page, 
-            size=size, 
-            location=location, 
+            page=page,
+            size=size,
+            location=location,
             business_type=business_type
         )
-        
-        return jsonify({
-            'results': businesses['results'],
-            'total': businesses['total'],
-            'page': businesses['page'],
-            'size': businesses['size'],
-            'total_pages': businesses['total_pages'],
-            'next_page': businesses['next_page'],
-            'url': request.url
-        })
+
+        # The DB layer already returns the complete response dict; tack
+        # on the request URL instead of re-wrapping it key by key
+        businesses['url'] = request.url
+        return jsonify(businesses)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -62,19 +75,25 @@ def search_businesses():
         return jsonify({'error': 'Location is required'}), 400
     
     try:
-        from yelp_api_client import YelpAPIClient
-        api_client = YelpAPIClient()
-        
-        businesses = api_client.search_businesses(
-            location=location,
-            business_type=business_type,
-            radius=radius * 1609,  # Convert to meters
-            max_results=max_results
+        businesses = _yelp_search(
+            location,
+            business_type,
+            radius * 1609,  # Convert to meters
+            max_results
         )
-        
+
+        # The cache holds compact YelpBusiness records; dicts are built
+        # once here at the response/upsert boundary
+        results = [business.to_dict() for business in businesses]
+
+        # Persist results so identical future queries can be served from
+        # the DB path (get_businesses) without touching the API at all
+        if results:
+            db_manager.upsert_businesses(results)
+
         return jsonify({
-            'results': businesses,
-            'total': len(businesses),
+            'results': results,
+            'total': len(results),
             'location': location,
             'business_type': business_type,
             'radius': radius,
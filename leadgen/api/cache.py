@@ -0,0 +1,54 @@
+"""
+In-process response cache for GET list endpoints
+
+Redis would be the cross-process version of this; for a single-process
+deployment a module-level dict gives the same effect with zero moving
+parts. Cached handlers also emit an ETag and answer matching
+If-None-Match requests with an empty 304, so polling clients pay
+neither the query nor the transfer.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from flask import Response, request
+
+
+def cached_json(ttl=30):
+    """Cache a JSON GET handler's rendered response for ``ttl`` seconds.
+
+    The decorated handler gains an ``invalidate()`` attribute; write
+    endpoints call it so the next read re-queries immediately instead of
+    waiting out the TTL. Only 200 responses are cached.
+    """
+    def decorator(f):
+        state = {'body': None, 'etag': None, 'exp': 0.0}
+
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            now = time.monotonic()
+            if state['body'] is None or now >= state['exp']:
+                resp = f(*args, **kwargs)
+                if isinstance(resp, tuple) or resp.status_code != 200:
+                    return resp
+                body = resp.get_data()
+                state['etag'] = hashlib.md5(body).hexdigest()
+                state['body'] = body
+                state['exp'] = now + ttl
+
+            if request.if_none_match.contains(state['etag']):
+                response = Response(status=304)
+            else:
+                response = Response(state['body'],
+                                    mimetype='application/json')
+            response.set_etag(state['etag'])
+            return response
+
+        def invalidate():
+            state['body'] = None
+            state['exp'] = 0.0
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
@@ -2,27 +2,47 @@
 Contacts API endpoints
 """
 
+from operator import attrgetter
+
 from flask import Blueprint, jsonify, request
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from leadgen import db
-from leadgen.model import Contact, Business
+from leadgen.api.cache import cached_json
+from leadgen.models import Contact
 
 api = Blueprint('contacts', __name__)
 
+# Serializer compiled once at import: attrgetter fetches every field in
+# a single C call and dict(zip(...)) builds the row without a Python
+# attribute lookup per key per object
+_CONTACT_KEYS = ('contactid', 'business_id', 'name', 'email', 'phone',
+                 'position', 'notes')
+_CONTACT_GET = attrgetter(*_CONTACT_KEYS)
+_CONTACT_ROW_KEYS = _CONTACT_KEYS + ('created',)
+
+
+def _serialize_contact(contact):
+    """Build the JSON dict for one contact."""
+    row = dict(zip(_CONTACT_KEYS, _CONTACT_GET(contact)))
+    # raw datetime: the JSON provider encodes it as ISO 8601
+    row['created'] = contact.created
+    return row
+
+
 @api.route('/')
+@cached_json(ttl=30)
 def get_contacts_list():
     """Get list of contacts"""
     try:
-        contacts = Contact.query.all()
-        return jsonify([{
-            'contactid': c.contactid,
-            'business_id': c.business_id,
-            'name': c.name,
-            'email': c.email,
-            'phone': c.phone,
-            'position': c.position,
-            'notes': c.notes,
-            'created': c.created.isoformat() if c.created else None
-        } for c in contacts])
+        # Core select of plain column tuples — no mapped-instance
+        # construction or identity-map bookkeeping per row, and the
+        # timestamp is formatted by SQLite itself
+        rows = db.session.execute(select(
+            *_CONTACT_GET(Contact),
+            func.strftime('%Y-%m-%dT%H:%M:%S', Contact.created).label('created')
+        )).all()
+        return jsonify([dict(zip(_CONTACT_ROW_KEYS, row)) for row in rows])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -37,12 +57,7 @@ def create_contact():
         business_id = data.get('business_id')
         if not business_id:
             return jsonify({'error': 'business_id is required'}), 400
-        
-        # Check if business exists
-        business = Business.query.get(business_id)
-        if not business:
-            return jsonify({'error': 'Business not found'}), 404
-        
+
         contact = Contact(
             business_id=business_id,
             name=data.get('name'),
@@ -52,20 +67,54 @@ def create_contact():
             notes=data.get('notes')
         )
         
+        # No pre-check SELECT: the businesses FK (enforced via PRAGMA
+        # foreign_keys=ON) rejects unknown ids at INSERT time
         db.session.add(contact)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({'error': 'Business not found'}), 404
+        get_contacts_list.invalidate()
+
+        row = _serialize_contact(contact)
+        row['url'] = f'/api/v1/contacts/{contact.contactid}/'
+        return jsonify(row), 201
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/bulk', methods=['POST'])
+def create_contacts_bulk():
+    """Create many contacts in one multi-row INSERT"""
+    try:
+        data = request.get_json()
+        if not isinstance(data, list) or not data:
+            return jsonify({'error': 'JSON list required'}), 400
+
+        items = []
+        for entry in data:
+            business_id = entry.get('business_id')
+            if not business_id:
+                return jsonify({'error': 'business_id is required for every contact'}), 400
+            items.append({
+                'business_id': business_id,
+                'name': entry.get('name'),
+                'email': entry.get('email'),
+                'phone': entry.get('phone'),
+                'position': entry.get('position'),
+                'notes': entry.get('notes')
+            })
+
+        # One multi-row INSERT without per-instance unit-of-work
+        # bookkeeping, instead of add()+commit() per contact
+        db.session.bulk_insert_mappings(Contact, items)
         db.session.commit()
-        
-        return jsonify({
-            'contactid': contact.contactid,
-            'business_id': contact.business_id,
-            'name': contact.name,
-            'email': contact.email,
-            'phone': contact.phone,
-            'position': contact.position,
-            'notes': contact.notes,
-            'url': f'/api/v1/contacts/{contact.contactid}/'
-        }), 201
-        
+        get_contacts_list.invalidate()
+
+        return jsonify({'created': len(items)}), 201
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -77,17 +126,8 @@ def get_contact_detail(contact_id):
         contact = Contact.query.get(contact_id)
         if not contact:
             return jsonify({'error': 'Contact not found'}), 404
-        
-        return jsonify({
-            'contactid': contact.contactid,
-            'business_id': contact.business_id,
-            'name': contact.name,
-            'email': contact.email,
-            'phone': contact.phone,
-            'position': contact.position,
-            'notes': contact.notes,
-            'created': contact.created.isoformat() if contact.created else None
-        })
+
+        return jsonify(_serialize_contact(contact))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -116,7 +156,8 @@ def update_contact(contact_id):
             contact.notes = data['notes']
         
         db.session.commit()
-        
+        get_contacts_list.invalidate()
+
         return jsonify({'message': 'Contact updated successfully'})
     except Exception as e:
         db.session.rollback()
@@ -132,7 +173,8 @@ def delete_contact(contact_id):
         
         db.session.delete(contact)
         db.session.commit()
-        
+        get_contacts_list.invalidate()
+
         return jsonify({'message': 'Contact deleted successfully'})
     except Exception as e:
         db.session.rollback()
@@ -2,153 +2,236 @@
 Exports API endpoints
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+
 from flask import Blueprint, jsonify, request, send_file
-from leadgen import db
-from leadgen.model import Export, Business, Lead
+from sqlalchemy import func, select
+from sqlalchemy.orm import contains_eager
+from leadgen import app, db
+from leadgen.api.cache import cached_json
+from leadgen.models import Export, Business, Lead
 from excel_generator import ExcelGenerator
 import os
 
 api = Blueprint('exports', __name__)
 excel_gen = ExcelGenerator()
 
+# Excel generation runs here instead of on the request thread, so a big
+# export returns 202 immediately and never ties up a web worker. An RQ/
+# Celery queue would be the multi-process version; a small in-process
+# pool fits this deployment without a broker
+_EXPORT_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='export')
+
+# Serializer compiled once at import, mirroring contacts.py: one C-level
+# attrgetter call per row instead of an attribute lookup per field
+_EXPORT_KEYS = ('exportid', 'user_id', 'filename', 'filepath',
+                'record_count', 'status')
+_EXPORT_GET = attrgetter(*_EXPORT_KEYS)
+_EXPORT_ROW_KEYS = _EXPORT_KEYS + ('created',)
+
+
+def _finish_export(export_id, filepath, record_count):
+    """Record a finished (or empty) export run; runs inside the job."""
+    export = db.session.get(Export, export_id)
+    if record_count == 0:
+        os.remove(filepath)
+        export.status = 'failed'
+    else:
+        export.filename = os.path.basename(filepath)
+        export.filepath = filepath
+        export.record_count = record_count
+        export.status = 'ready'
+    db.session.commit()
+    get_exports_list.invalidate()
+
+
+def _fail_export(export_id):
+    """Mark an export row failed after a job raised."""
+    db.session.rollback()
+    export = db.session.get(Export, export_id)
+    if export is not None:
+        export.status = 'failed'
+        db.session.commit()
+    get_exports_list.invalidate()
+
+
 @api.route('/')
+@cached_json(ttl=30)
 def get_exports_list():
     """Get list of exports"""
     try:
-        exports = Export.query.all()
-        return jsonify([{
-            'exportid': e.exportid,
-            'user_id': e.user_id,
-            'filename': e.filename,
-            'filepath': e.filepath,
-            'record_count': e.record_count,
-            'created': e.created.isoformat() if e.created else None
-        } for e in exports])
+        # Core select of plain column tuples — no mapped-instance
+        # construction or identity-map bookkeeping per row, and the
+        # timestamp is formatted by SQLite itself
+        rows = db.session.execute(select(
+            *_EXPORT_GET(Export),
+            func.strftime('%Y-%m-%dT%H:%M:%S', Export.created).label('created')
+        )).all()
+        return jsonify([dict(zip(_EXPORT_ROW_KEYS, row)) for row in rows])
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _run_business_export(export_id, business_ids, filename):
+    """Generate a business export on the worker pool."""
+    with app.app_context():
+        try:
+            # stream_results + yield_per trickles rows from the DB in
+            # batches instead of loading every ORM object before the
+            # first Excel row is written
+            query = Business.query.execution_options(stream_results=True)
+            if business_ids:
+                query = query.filter(Business.id.in_(business_ids))
+
+            record_count = 0
+
+            def rows():
+                nonlocal record_count
+                for b in query.yield_per(1000):
+                    record_count += 1
+                    yield (b.name, b.address, b.city, b.state, b.zip_code,
+                           b.phone, b.website, b.business_type, b.rating,
+                           b.review_count, b.price_level, b.yelp_url)
+
+            # export_to_excel derives the count-based default filename
+            # once the streaming pass is done
+            filepath = excel_gen.export_to_excel(businesses=rows(),
+                                                 filename=filename)
+            _finish_export(export_id, filepath, record_count)
+        except Exception:
+            _fail_export(export_id)
+
+
 @api.route('/businesses/', methods=['POST'])
 def export_businesses():
-    """Export businesses to Excel"""
+    """Export businesses to Excel in the background"""
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'JSON data required'}), 400
-        
-        # Get businesses to export
-        business_ids = data.get('business_ids', [])
-        if not business_ids:
-            # Export all businesses
-            businesses = Business.query.all()
-        else:
-            businesses = Business.query.filter(Business.businessid.in_(business_ids)).all()
-        
-        if not businesses:
-            return jsonify({'error': 'No businesses found to export'}), 404
-        
-        # Convert to dict format
-        business_data = []
-        for business in businesses:
-            business_data.append({
-                'name': business.name,
-                'address': business.address,
-                'city': business.city,
-                'state': business.state,
-                'zip_code': business.zip_code,
-                'phone': business.phone,
-                'website': business.website,
-                'business_type': business.business_type,
-                'rating': business.rating,
-                'review_count': business.review_count,
-                'price_level': business.price_level,
-                'yelp_url': business.yelp_url
-            })
-        
-        # Generate Excel file
-        filename = data.get('filename', f'business_export_{len(business_data)}_records.xlsx')
-        filepath = excel_gen.export_to_excel(businesses=business_data, filename=filename)
-        
-        # Save export record
+
+        # Create the pending record, hand the generation to the worker
+        # pool, and return immediately; clients poll the detail route
         export = Export(
             user_id=data.get('user_id', 1),
-            filename=os.path.basename(filepath),
-            filepath=filepath,
-            record_count=len(business_data)
+            filename=data.get('filename') or 'pending',
+            filepath='',
+            record_count=0,
+            status='pending'
         )
         db.session.add(export)
         db.session.commit()
-        
+        get_exports_list.invalidate()
+
+        _EXPORT_POOL.submit(_run_business_export, export.exportid,
+                            data.get('business_ids', []),
+                            data.get('filename'))
+
         return jsonify({
             'exportid': export.exportid,
-            'filename': export.filename,
-            'filepath': export.filepath,
-            'record_count': export.record_count,
-            'url': f'/api/v1/exports/{export.exportid}/download/'
-        }), 201
-        
+            'status': export.status,
+            'url': f'/api/v1/exports/{export.exportid}/'
+        }), 202
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def _run_lead_export(export_id, lead_ids, filename):
+    """Generate a lead export on the worker pool."""
+    with app.app_context():
+        try:
+            # One streamed JOIN: contains_eager hydrates lead.business
+            # straight from the join result, so no per-batch business
+            # SELECT runs and no ORM object loads up front
+            query = (Lead.query
+                     .join(Lead.business)
+                     .options(contains_eager(Lead.business))
+                     .execution_options(stream_results=True))
+            if lead_ids:
+                query = query.filter(Lead.leadid.in_(lead_ids))
+
+            record_count = 0
+
+            def rows():
+                nonlocal record_count
+                for lead in query.yield_per(1000):
+                    record_count += 1
+                    yield (lead.leadid,
+                           lead.business.name,
+                           lead.business.address,
+                           lead.business.phone,
+                           lead.business.website,
+                           lead.status,
+                           lead.notes,
+                           lead.created.isoformat() if lead.created else None)
+
+            # Rename to the count-based default once the streaming pass
+            # has established the row count
+            filepath = excel_gen.export_leads_to_excel(leads=rows(),
+                                                       filename=filename)
+            if record_count and not filename:
+                named = os.path.join(
+                    os.path.dirname(filepath),
+                    f'leads_export_{record_count}_records.xlsx'
+                )
+                os.replace(filepath, named)
+                filepath = named
+
+            _finish_export(export_id, filepath, record_count)
+        except Exception:
+            _fail_export(export_id)
+
+
 @api.route('/leads/', methods=['POST'])
 def export_leads():
-    """Export leads to Excel"""
+    """Export leads to Excel in the background"""
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'JSON data required'}), 400
-        
-        # Get leads to export
-        lead_ids = data.get('lead_ids', [])
-        if not lead_ids:
-            # Export all leads
-            leads = Lead.query.all()
-        else:
-            leads = Lead.query.filter(Lead.leadid.in_(lead_ids)).all()
-        
-        if not leads:
-            return jsonify({'error': 'No leads found to export'}), 404
-        
-        # Convert to dict format
-        lead_data = []
-        for lead in leads:
-            lead_data.append({
-                'leadid': lead.leadid,
-                'business_name': lead.business.name if lead.business else 'Unknown',
-                'business_address': lead.business.address if lead.business else '',
-                'business_phone': lead.business.phone if lead.business else '',
-                'business_website': lead.business.website if lead.business else '',
-                'status': lead.status,
-                'notes': lead.notes,
-                'created': lead.created.isoformat() if lead.created else None
-            })
-        
-        # Generate Excel file
-        filename = data.get('filename', f'leads_export_{len(lead_data)}_records.xlsx')
-        filepath = excel_gen.export_leads_to_excel(leads=lead_data, filename=filename)
-        
-        # Save export record
+
         export = Export(
             user_id=data.get('user_id', 1),
-            filename=os.path.basename(filepath),
-            filepath=filepath,
-            record_count=len(lead_data)
+            filename=data.get('filename') or 'pending',
+            filepath='',
+            record_count=0,
+            status='pending'
         )
         db.session.add(export)
         db.session.commit()
-        
+        get_exports_list.invalidate()
+
+        _EXPORT_POOL.submit(_run_lead_export, export.exportid,
+                            data.get('lead_ids', []),
+                            data.get('filename'))
+
         return jsonify({
             'exportid': export.exportid,
-            'filename': export.filename,
-            'filepath': export.filepath,
-            'record_count': export.record_count,
-            'url': f'/api/v1/exports/{export.exportid}/download/'
-        }), 201
-        
+            'status': export.status,
+            'url': f'/api/v1/exports/{export.exportid}/'
+        }), 202
+
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@api.route('/<int:export_id>/')
+def get_export_detail(export_id):
+    """Get export status and details (poll here after a 202)"""
+    try:
+        export = db.session.get(Export, export_id)
+        if not export:
+            return jsonify({'error': 'Export not found'}), 404
+
+        row = dict(zip(_EXPORT_KEYS, _EXPORT_GET(export)))
+        row['created'] = export.created
+        if export.status == 'ready':
+            row['download_url'] = f'/api/v1/exports/{export.exportid}/download/'
+        return jsonify(row)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @api.route('/<int:export_id>/download/')
 def download_export(export_id):
     """Download export file"""
@@ -156,14 +239,26 @@ def download_export(export_id):
         export = Export.query.get(export_id)
         if not export:
             return jsonify({'error': 'Export not found'}), 404
-        
-        if not os.path.exists(export.filepath):
+
+        if export.status == 'pending':
+            return jsonify({'error': 'Export still processing'}), 409
+
+        # One stat doubles as the existence check and warms the
+        # size/mtime that conditional=True uses for Range/304 handling
+        try:
+            os.stat(export.filepath)
+        except OSError:
             return jsonify({'error': 'Export file not found'}), 404
-        
+
+        # conditional=True serves Range requests and 304s from the file's
+        # mtime/size; with USE_X_SENDFILE (or a wsgi.file_wrapper-aware
+        # server) the bytes never pass through Python at all
         return send_file(
             export.filepath,
             as_attachment=True,
-            download_name=export.filename
+            download_name=export.filename,
+            conditional=True,
+            etag=True
         )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -3,31 +3,35 @@ Leads API endpoints
 """
 
 from flask import Blueprint, jsonify, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import joinedload
 from leadgen import db
-from leadgen.model import Lead, Business, User
+from leadgen.models import Lead
 from database_manager import DatabaseManager
 
 api = Blueprint('leads', __name__)
 db_manager = DatabaseManager()
 
+# Loader options built once at import; together with the engine's
+# compiled-statement cache the detail SELECT is compiled a single time
+# and only re-executed per request
+_LEAD_DETAIL_OPTIONS = (joinedload(Lead.business),)
+
 @api.route('/')
 def get_leads_list():
-    """Get list of leads with pagination"""
+    """Get list of leads with pagination.
+
+    Pass ?after=<leadid> (0 for the newest page) to page by keyset —
+    constant cost at any depth. page/size remains as a deprecated shim.
+    """
     page = request.args.get('page', 1, type=int)
     size = request.args.get('size', 10, type=int)
-    
+    after = request.args.get('after', type=int)
+
     try:
-        leads = db_manager.get_leads(page=page, size=size)
-        
-        return jsonify({
-            'results': leads['results'],
-            'total': leads['total'],
-            'page': leads['page'],
-            'size': leads['size'],
-            'total_pages': leads['total_pages'],
-            'next_page': leads['next_page'],
-            'url': request.url
-        })
+        leads = db_manager.get_leads(page=page, size=size, after=after)
+        leads['url'] = request.url
+        return jsonify(leads)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -70,32 +74,27 @@ def create_new_lead():
 def get_lead_detail(lead_id):
     """Get specific lead details"""
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT l.leadid, l.business_id, l.user_id, l.status, l.notes, l.created,
-                       b.name, b.address, b.phone, b.website
-                FROM leads l
-                JOIN businesses b ON l.business_id = b.businessid
-                WHERE l.leadid = ?
-            """, (lead_id,))
-            
-            row = cursor.fetchone()
-            if not row:
-                return jsonify({'error': 'Lead not found'}), 404
-            
-            return jsonify({
-                'leadid': row[0],
-                'business_id': row[1],
-                'user_id': row[2],
-                'status': row[3],
-                'notes': row[4],
-                'created': row[5],
-                'business_name': row[6],
-                'business_address': row[7],
-                'business_phone': row[8],
-                'business_website': row[9]
-            })
+        # Pooled SQLAlchemy session instead of a raw per-request sqlite
+        # cursor; joinedload pulls the business in the same SELECT
+        lead = db.session.get(Lead, lead_id,
+                              options=_LEAD_DETAIL_OPTIONS)
+        if not lead:
+            return jsonify({'error': 'Lead not found'}), 404
+
+        business = lead.business
+        return jsonify({
+            'leadid': lead.leadid,
+            'business_id': lead.business_id,
+            'user_id': lead.user_id,
+            'status': lead.status,
+            'notes': lead.notes,
+            # raw datetime: the JSON provider encodes it as ISO 8601
+            'created': lead.created,
+            'business_name': business.name if business else None,
+            'business_address': business.address if business else None,
+            'business_phone': business.phone if business else None,
+            'business_website': business.website if business else None
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -107,55 +106,53 @@ def update_lead(lead_id):
         if not data:
             return jsonify({'error': 'JSON data required'}), 400
         
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if lead exists
-            cursor.execute("SELECT leadid FROM leads WHERE leadid = ?", (lead_id,))
-            if not cursor.fetchone():
-                return jsonify({'error': 'Lead not found'}), 404
-            
-            # Update lead
-            updates = []
-            params = []
-            
-            if 'status' in data:
-                updates.append("status = ?")
-                params.append(data['status'])
-            
-            if 'notes' in data:
-                updates.append("notes = ?")
-                params.append(data['notes'])
-            
-            if updates:
-                params.append(lead_id)
-                cursor.execute(f"""
-                    UPDATE leads 
-                    SET {', '.join(updates)}
-                    WHERE leadid = ?
-                """, params)
-                conn.commit()
-            
-            return jsonify({'message': 'Lead updated successfully'})
+        values = {}
+        if 'status' in data:
+            values['status'] = data['status']
+        if 'notes' in data:
+            values['notes'] = data['notes']
+
+        # One UPDATE ... RETURNING round trip; the returned key doubles
+        # as the existence check, so no SELECT runs first
+        if values:
+            found = db.session.execute(
+                update(Lead)
+                .where(Lead.leadid == lead_id)
+                .values(**values)
+                .returning(Lead.leadid)
+            ).first()
+        else:
+            found = db.session.execute(
+                select(Lead.leadid).where(Lead.leadid == lead_id)
+            ).first()
+
+        if found is None:
+            db.session.rollback()
+            return jsonify({'error': 'Lead not found'}), 404
+        db.session.commit()
+
+        return jsonify({'message': 'Lead updated successfully'})
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @api.route('/<int:lead_id>/', methods=['DELETE'])
 def delete_lead(lead_id):
     """Delete a lead"""
     try:
-        with db_manager.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Check if lead exists
-            cursor.execute("SELECT leadid FROM leads WHERE leadid = ?", (lead_id,))
-            if not cursor.fetchone():
-                return jsonify({'error': 'Lead not found'}), 404
-            
-            # Delete lead
-            cursor.execute("DELETE FROM leads WHERE leadid = ?", (lead_id,))
-            conn.commit()
-            
-            return jsonify({'message': 'Lead deleted successfully'})
+        # One DELETE ... RETURNING round trip, existence check included
+        found = db.session.execute(
+            delete(Lead)
+            .where(Lead.leadid == lead_id)
+            .returning(Lead.leadid)
+        ).first()
+
+        if found is None:
+            db.session.rollback()
+            return jsonify({'error': 'Lead not found'}), 404
+        db.session.commit()
+
+        return jsonify({'message': 'Lead deleted successfully'})
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -6,6 +6,16 @@ from leadgen import db
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
+try:
+    # argon2's C implementation hashes several-fold faster than a pure
+    # pbkdf2 loop at equivalent security; the hasher is built once at
+    # import so its parameters aren't re-parsed per login
+    from argon2 import PasswordHasher
+    from argon2.exceptions import VerifyMismatchError
+    _password_hasher = PasswordHasher()
+except ImportError:
+    _password_hasher = None
+
 class User(db.Model):
     """User model for authentication"""
     __tablename__ = 'users'
@@ -24,11 +34,28 @@ class User(db.Model):
     
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
-    
+        if _password_hasher is not None:
+            self.password_hash = _password_hasher.hash(password)
+        else:
+            self.password_hash = generate_password_hash(password)
+
     def check_password(self, password):
         """Check password hash"""
-        return check_password_hash(self.password_hash, password)
+        if self.password_hash.startswith('$argon2'):
+            if _password_hasher is None:
+                return False
+            try:
+                _password_hasher.verify(self.password_hash, password)
+                return True
+            except VerifyMismatchError:
+                return False
+        # Legacy werkzeug hash (pbkdf2/scrypt): verify with werkzeug,
+        # then migrate to argon2 in place so the next login is fast.
+        # The caller owns the transaction and must commit the rehash
+        ok = check_password_hash(self.password_hash, password)
+        if ok and _password_hasher is not None:
+            self.password_hash = _password_hasher.hash(password)
+        return ok
     
     def to_dict(self):
         """Convert to dictionary"""
@@ -99,12 +126,54 @@ class Business(db.Model):
             'created_at': self.created_at.isoformat()
         }
 
+class Lead(db.Model):
+    """Lead model"""
+    __tablename__ = 'leads'
+
+    leadid = db.Column(db.Integer, primary_key=True)
+    business_id = db.Column(db.Integer, db.ForeignKey('businesses.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    status = db.Column(db.String(50), default='new')
+    notes = db.Column(db.Text)
+    created = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    business = db.relationship('Business', backref='leads', lazy=True)
+
+class Contact(db.Model):
+    """Contact model"""
+    __tablename__ = 'contacts'
+
+    contactid = db.Column(db.Integer, primary_key=True)
+    business_id = db.Column(db.Integer, db.ForeignKey('businesses.id'), nullable=False, index=True)
+    name = db.Column(db.String(120))
+    email = db.Column(db.String(120))
+    phone = db.Column(db.String(20))
+    position = db.Column(db.String(100))
+    notes = db.Column(db.Text)
+    created = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    business = db.relationship('Business', backref='contacts', lazy=True)
+
+class Export(db.Model):
+    """Export model"""
+    __tablename__ = 'exports'
+
+    exportid = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    filename = db.Column(db.String(200), nullable=False)
+    filepath = db.Column(db.String(300), nullable=False)
+    record_count = db.Column(db.Integer)
+    status = db.Column(db.String(20), default='ready')  # pending, ready, failed
+    created = db.Column(db.DateTime, default=datetime.utcnow)
+
 class SavedList(db.Model):
     """Saved list model for user's saved searches"""
     __tablename__ = 'saved_lists'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     search_params = db.Column(db.Text)  # JSON string of search parameters
@@ -133,7 +202,7 @@ class CustomList(db.Model):
     __tablename__ = 'custom_lists'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     business_count = db.Column(db.Integer, default=0)
@@ -160,15 +229,23 @@ class ListContact(db.Model):
     __tablename__ = 'list_contacts'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    business_id = db.Column(db.Integer, db.ForeignKey('businesses.id'), nullable=False)
-    saved_list_id = db.Column(db.Integer, db.ForeignKey('saved_lists.id'), nullable=True)
-    custom_list_id = db.Column(db.Integer, db.ForeignKey('custom_lists.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    business_id = db.Column(db.Integer, db.ForeignKey('businesses.id'), nullable=False, index=True)
+    saved_list_id = db.Column(db.Integer, db.ForeignKey('saved_lists.id'), nullable=True, index=True)
+    custom_list_id = db.Column(db.Integer, db.ForeignKey('custom_lists.id'), nullable=True, index=True)
     notes = db.Column(db.Text)
     status = db.Column(db.String(50), default='new')  # new, contacted, qualified, closed
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
+
+    # The list endpoints always filter on (list id, user id) together;
+    # composite indexes answer those with one index seek instead of
+    # intersecting the single-column FK indexes
+    __table_args__ = (
+        db.Index('ix_listcontact_custom_user', 'custom_list_id', 'user_id'),
+        db.Index('ix_listcontact_saved_user', 'saved_list_id', 'user_id'),
+    )
+
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -3,10 +3,15 @@ Authentication views for Lead Generator
 Matching LegislationForDumbies pattern
 """
 
-from flask import Blueprint, request, jsonify, session, redirect, url_for, render_template
+from flask import Blueprint, g, request, jsonify, session, redirect, url_for, render_template
 from leadgen import db
 from leadgen.models import User
 import os
+import time
+
+# How long the serialized user rides along in the session cookie before
+# auth_status refreshes it from the database
+USER_CACHE_TTL = 60
 
 auth = Blueprint('auth', __name__)
 
@@ -23,8 +28,14 @@ def login():
         user = User.query.filter_by(username=username).first()
         
         if user and user.check_password(password):
+            # check_password rehashes legacy werkzeug hashes to argon2
+            # in place; commit the migration or it rolls back with the
+            # session and every login re-pays the pbkdf2 verify
+            if db.session.is_modified(user):
+                db.session.commit()
             session['user_id'] = user.id
             session['username'] = user.username
+            cache_user(user)
             return redirect(url_for('dashboard.main_dashboard'))
     
     return render_template('login.html')
@@ -68,17 +79,52 @@ def logout():
     session.clear()
     return redirect(url_for('auth.login'))
 
+def current_user():
+    """Return the logged-in User, loading it at most once per request.
+
+    The row is memoized on ``g``, so however many handlers and helpers
+    ask for it, a request issues a single SELECT — or none at all when
+    nothing touches the user.
+    """
+    uid = session.get('user_id')
+    if uid is None:
+        return None
+    if 'user' not in g:
+        g.user = db.session.get(User, uid)
+    return g.user
+
+
+def cache_user(user):
+    """Stash the serialized user in the session for auth_status."""
+    session['user_cache'] = user.to_dict()
+    session['user_cache_exp'] = time.time() + USER_CACHE_TTL
+
+
+def invalidate_user_cache():
+    """Drop the cached user dict after a password/profile change."""
+    session.pop('user_cache', None)
+    session.pop('user_cache_exp', None)
+
+
 @auth.route('/api/auth/status')
 def auth_status():
     """Check authentication status - matching LegislationForDumbies pattern"""
     if 'user_id' in session:
-        user = User.query.get(session['user_id'])
+        # Hot poll path: serve the session-cached dict while it's fresh
+        # instead of one SELECT per poll
+        if session.get('user_cache_exp', 0) > time.time():
+            return jsonify({
+                'authenticated': True,
+                'user': session['user_cache']
+            })
+        user = current_user()
         if user:
+            cache_user(user)
             return jsonify({
                 'authenticated': True,
                 'user': user.to_dict()
             })
-    
+
     return jsonify({'authenticated': False})
 
 def require_auth(f):
@@ -2,18 +2,189 @@
 Dashboard views for Lead Generator
 """
 
+from operator import attrgetter
+
 from flask import Blueprint, render_template, jsonify, request, session, redirect
-from leadgen import db
+from sqlalchemy import func, select
+from sqlalchemy.orm import raiseload
+from leadgen import app, db
 from leadgen.models import User, Business, SavedList, CustomList, ListContact
 from business_finder import BusinessFinder, BusinessSearchParams
 from category_helper import CategoryHelper
-from leadgen.views.auth import require_auth
+from leadgen.views.auth import require_auth, invalidate_user_cache, current_user
 import os
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 dashboard = Blueprint('dashboard', __name__)
 
+# Upstream Yelp results cached by normalized search params: paging
+# through a search serves every page from one upstream call instead of
+# re-hitting Yelp per page. Redis would make this cross-process; an
+# in-process dict covers this deployment
+_YELP_CACHE = {}
+_YELP_CACHE_TTL = 3600
+
+# Categories are static reference data: serialize the response once at
+# import and hand every request the same string
+_POPULAR_CATEGORIES = [
+    {'alias': cat['alias'], 'title': cat['title']}
+    for cat in CategoryHelper().get_popular_categories()
+]
+_POPULAR_CATEGORIES_JSON = app.json.dumps({
+    'results': _POPULAR_CATEGORIES,
+    'total': len(_POPULAR_CATEGORIES)
+})
+
+
+# Business serializer compiled once at import, mirroring contacts.py:
+# Core selects return plain column tuples (no mapped-instance
+# construction or identity-map bookkeeping) and dict(zip(...)) builds
+# each row without a Python attribute lookup per field
+_BUSINESS_COLS = (
+    'id', 'yelp_id', 'name', 'address', 'city', 'state', 'zip_code',
+    'phone', 'website', 'business_type', 'rating', 'review_count',
+    'price_level', 'yelp_url', 'address_verified',
+    'address_verification_status', 'verified_address', 'verified_city',
+    'verified_state', 'verified_zip_code', 'verification_confidence',
+    'created_at'
+)
+_BUSINESS_GET = attrgetter(*_BUSINESS_COLS)
+# JOIN rows append the list-contact fields; the trailing created_at
+# overwrites the business one in dict(zip), matching to_dict behaviour
+_LIST_BUSINESS_COLS = _BUSINESS_COLS + ('notes', 'status', 'created_at')
+
+
+# Address verification (one Smarty HTTP call per new business) and the
+# insert run here, off the request thread, so search latency is just the
+# Yelp fetch; mirrors the export worker pool in the exports API
+_PERSIST_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='persist')
+
+# Smarty results cached by normalized address tuple, mirroring the Yelp
+# cache: overlapping searches share many addresses and each miss is a
+# paid HTTP call. Verification data for one address doesn't go stale,
+# so entries live until the size cap recycles the dict
+_VERIFY_CACHE = {}
+_VERIFY_CACHE_MAX = 10000
+_VERIFY_FIELDS = ('address_verified', 'address_verification_status',
+                  'verified_address', 'verified_city', 'verified_state',
+                  'verified_zip_code', 'verification_confidence')
+
+
+def _verify_address_cached(finder, business):
+    """Verify one business address, reusing prior Smarty results."""
+    location = business.get('location', {})
+    key = (location.get('address1', '').lower(),
+           location.get('city', '').lower(),
+           location.get('state', '').lower(),
+           location.get('zip_code', ''))
+    hit = _VERIFY_CACHE.get(key)
+    if hit is not None:
+        business.update(hit)
+        return business
+    business = finder.verify_business_address(business)
+    # Cache only completed verifications — skipped or errored calls
+    # should retry on the next sighting of the address
+    if 'address_verified' in business and 'verification_error' not in business:
+        if len(_VERIFY_CACHE) >= _VERIFY_CACHE_MAX:
+            _VERIFY_CACHE.clear()
+        _VERIFY_CACHE[key] = {field: business[field] for field in _VERIFY_FIELDS}
+    return business
+
+
+def _yelp_response_dict(business, business_type):
+    """Shape a raw Yelp result like Business.to_dict for the response."""
+    location = business.get('location', {})
+    return {
+        'id': None,
+        'yelp_id': business.get('id'),
+        'name': business.get('name'),
+        'address': location.get('address1', ''),
+        'city': location.get('city', ''),
+        'state': location.get('state', ''),
+        'zip_code': location.get('zip_code', ''),
+        'phone': business.get('phone', ''),
+        'website': business.get('url', ''),
+        'business_type': business_type,
+        'rating': business.get('rating', 0),
+        'review_count': business.get('review_count', 0),
+        'price_level': business.get('price', ''),
+        'yelp_url': business.get('url', ''),
+        'address_verified': business.get('address_verified', False),
+        'address_verification_status': business.get('address_verification_status', 'pending'),
+        'verified_address': business.get('verified_address'),
+        'verified_city': business.get('verified_city'),
+        'verified_state': business.get('verified_state'),
+        'verified_zip_code': business.get('verified_zip_code'),
+        'verification_confidence': business.get('verification_confidence', 0.0),
+        'created_at': None
+    }
+
+
+def _verify_and_persist(raw_businesses, business_type):
+    """Verify addresses and insert new businesses on the worker pool."""
+    with app.app_context():
+        try:
+            finder = BusinessFinder(yelp_api_key=os.getenv('YELP_API_KEY'),
+                                    google_api_key=os.getenv('GOOGLE_API_KEY'))
+            # Re-check existence here: another job may have inserted the
+            # same page while this one waited in the queue
+            yelp_ids = [b.get('id') for b in raw_businesses]
+            known = {
+                row[0] for row in
+                db.session.query(Business.yelp_id)
+                .filter(Business.yelp_id.in_(yelp_ids)).all()
+            }
+            new_rows = []
+            for business in raw_businesses:
+                if business.get('id') in known:
+                    continue
+                if 'address_verified' not in business:
+                    business = _verify_address_cached(finder, business)
+                new_rows.append(Business(
+                    yelp_id=business.get('id'),
+                    name=business.get('name'),
+                    address=business.get('location', {}).get('address1', ''),
+                    city=business.get('location', {}).get('city', ''),
+                    state=business.get('location', {}).get('state', ''),
+                    zip_code=business.get('location', {}).get('zip_code', ''),
+                    phone=business.get('phone', ''),
+                    website=business.get('url', ''),
+                    business_type=business_type,
+                    rating=business.get('rating', 0),
+                    review_count=business.get('review_count', 0),
+                    price_level=business.get('price', ''),
+                    yelp_url=business.get('url', ''),
+                    address_verified=business.get('address_verified', False),
+                    address_verification_status=business.get('address_verification_status', 'pending'),
+                    verified_address=business.get('verified_address'),
+                    verified_city=business.get('verified_city'),
+                    verified_state=business.get('verified_state'),
+                    verified_zip_code=business.get('verified_zip_code'),
+                    verification_confidence=business.get('verification_confidence', 0.0)
+                ))
+            # One transaction for the whole batch: a single commit/fsync,
+            # and a mid-batch failure rolls back atomically instead of
+            # leaving earlier rows persisted
+            db.session.add_all(new_rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+
+
+def _cached_yelp_search(finder, params):
+    """Fetch (or reuse) the full Yelp result list for a search."""
+    key = (params.city.lower(), params.industry.lower(),
+           params.distance_miles, params.max_results)
+    hit = _YELP_CACHE.get(key)
+    now = time.monotonic()
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    businesses = finder.search_yelp_businesses(params)
+    _YELP_CACHE[key] = (now + _YELP_CACHE_TTL, businesses)
+    return businesses
+
 @dashboard.route('/')
 def index():
     """Redirect to login if not authenticated, otherwise dashboard"""
@@ -55,13 +226,33 @@ def profile():
 
 @dashboard.route('/api/v1/businesses/')
 def get_businesses():
-    """Get businesses from database"""
+    """Get businesses from database.
+
+    Pages by keyset: pass ?cursor=<last id> to fetch the next page —
+    an index seek at any depth, unlike OFFSET. ?include_total=1 runs
+    the COUNT only when the client actually wants it.
+    """
     try:
-        businesses = Business.query.limit(50).all()
-        return jsonify({
-            'results': [business.to_dict() for business in businesses],
-            'total': len(businesses)
-        })
+        cursor = request.args.get('cursor', 0, type=int)
+        size = request.args.get('size', 50, type=int)
+
+        # Core select of column tuples instead of ORM instances +
+        # to_dict: no mapped-object materialization per row
+        query = select(*_BUSINESS_GET(Business)).order_by(Business.id)
+        if cursor:
+            query = query.where(Business.id > cursor)
+        rows = db.session.execute(query.limit(size)).all()
+
+        payload = {
+            'results': [dict(zip(_BUSINESS_COLS, row)) for row in rows],
+            'count': len(rows),
+            # `rows and` guards ?size=0, where zero rows still satisfy
+            # len(rows) == size
+            'next_cursor': rows[-1].id if rows and len(rows) == size else None
+        }
+        if request.args.get('include_total') == '1':
+            payload['total'] = db.session.query(func.count(Business.id)).scalar()
+        return jsonify(payload)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -101,53 +292,38 @@ def search_businesses():
             max_results=max_results
         )
         
-        # Search for businesses
-        businesses = finder.search_yelp_businesses(params)
+        # Search for businesses (cached across pages of the same search)
+        businesses = _cached_yelp_search(finder, params)
         
-        # Convert to API format and save to database
-        results = []
+        # Convert to API format; persistence happens off-thread
         start_idx = (page - 1) * size
         end_idx = start_idx + size
-        
-        for business in businesses[start_idx:end_idx]:
-            # Check if business already exists
-            existing_business = Business.query.filter_by(yelp_id=business.get('id')).first()
-            
-            if not existing_business:
-                # Verify address if Smarty Streets is available
-                if 'address_verified' not in business:
-                    business = finder.verify_business_address(business)
-                
-                # Create new business record
-                new_business = Business(
-                    yelp_id=business.get('id'),
-                    name=business.get('name'),
-                    address=business.get('location', {}).get('address1', ''),
-                    city=business.get('location', {}).get('city', ''),
-                    state=business.get('location', {}).get('state', ''),
-                    zip_code=business.get('location', {}).get('zip_code', ''),
-                    phone=business.get('phone', ''),
-                    website=business.get('url', ''),
-                    business_type=business_type,
-                    rating=business.get('rating', 0),
-                    review_count=business.get('review_count', 0),
-                    price_level=business.get('price', ''),
-                    yelp_url=business.get('url', ''),
-                    # Smarty Streets verification fields
-                    address_verified=business.get('address_verified', False),
-                    address_verification_status=business.get('address_verification_status', 'pending'),
-                    verified_address=business.get('verified_address'),
-                    verified_city=business.get('verified_city'),
-                    verified_state=business.get('verified_state'),
-                    verified_zip_code=business.get('verified_zip_code'),
-                    verification_confidence=business.get('verification_confidence', 0.0)
-                )
-                db.session.add(new_business)
-                db.session.commit()
-                existing_business = new_business
-            
-            results.append(existing_business.to_dict())
-        
+        page_slice = businesses[start_idx:end_idx]
+
+        # One IN query answers every existence check for the page,
+        # instead of a filter_by SELECT per item
+        yelp_ids = [b.get('id') for b in page_slice]
+        existing = {
+            b.yelp_id: b
+            for b in Business.query.filter(Business.yelp_id.in_(yelp_ids)).all()
+        }
+
+        results = []
+        new_raw = []
+        for business in page_slice:
+            existing_business = existing.get(business.get('id'))
+            if existing_business:
+                results.append(existing_business.to_dict())
+            else:
+                # Unknown business: answer straight from the Yelp data
+                # and queue verification + insert for the worker pool —
+                # the Smarty round-trip never blocks this response
+                results.append(_yelp_response_dict(business, business_type))
+                new_raw.append(business)
+
+        if new_raw:
+            _PERSIST_POOL.submit(_verify_and_persist, new_raw, business_type)
+
         # Check if there are more results
         has_more = end_idx < len(businesses)
         
@@ -174,7 +350,10 @@ def get_saved_lists():
         if not user_id:
             return jsonify({'error': 'Authentication required'}), 401
         
-        saved_lists = SavedList.query.filter_by(user_id=user_id).all()
+        # to_dict is column-only; raiseload('*') guarantees this stays a
+        # single query and can never silently grow an N+1 lazy load
+        saved_lists = (SavedList.query.options(raiseload('*'))
+                       .filter_by(user_id=user_id).all())
         return jsonify({
             'results': [saved_list.to_dict() for saved_list in saved_lists],
             'total': len(saved_lists)
@@ -224,7 +403,9 @@ def get_custom_lists():
         if not user_id:
             return jsonify({'error': 'Authentication required'}), 401
         
-        custom_lists = CustomList.query.filter_by(user_id=user_id).all()
+        # Single query, enforced the same way as get_saved_lists
+        custom_lists = (CustomList.query.options(raiseload('*'))
+                        .filter_by(user_id=user_id).all())
         return jsonify({
             'results': [custom_list.to_dict() for custom_list in custom_lists],
             'total': len(custom_lists)
@@ -317,24 +498,14 @@ def save_contact():
 @dashboard.route('/api/v1/categories/')
 def get_categories():
     """Get available business categories"""
-    try:
-        helper = CategoryHelper()
-        popular = helper.get_popular_categories()
-        
-        categories = []
-        for cat in popular:
-            categories.append({
-                'alias': cat['alias'],
-                'title': cat['title']
-            })
-        
-        return jsonify({
-            'results': categories,
-            'total': len(categories)
-        })
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    from flask import Response
+    # Pre-serialized at import; Cache-Control lets browsers skip the
+    # request entirely for a day
+    return Response(
+        _POPULAR_CATEGORIES_JSON,
+        mimetype='application/json',
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
 
 @dashboard.route('/api/v1/saved-lists/<int:list_id>/', methods=['DELETE'])
 def delete_saved_list(list_id):
@@ -388,22 +559,19 @@ def get_custom_list_businesses(list_id):
         if not custom_list:
             return jsonify({'error': 'List not found'}), 404
         
-        # Get list contacts for this custom list
-        list_contacts = ListContact.query.filter_by(
-            custom_list_id=list_id,
-            user_id=user_id
+        # One JOIN instead of a Business.query.get per contact (N+1),
+        # selecting column tuples so no ORM instance is built per row
+        rows = db.session.execute(
+            select(*_BUSINESS_GET(Business), ListContact.notes,
+                   ListContact.status, ListContact.created_at)
+            .join_from(Business, ListContact,
+                       ListContact.business_id == Business.id)
+            .where(ListContact.custom_list_id == list_id,
+                   ListContact.user_id == user_id)
         ).all()
-        
-        businesses = []
-        for contact in list_contacts:
-            business = Business.query.get(contact.business_id)
-            if business:
-                business_dict = business.to_dict()
-                business_dict['notes'] = contact.notes
-                business_dict['status'] = contact.status
-                business_dict['created_at'] = contact.created_at.isoformat()
-                businesses.append(business_dict)
-        
+
+        businesses = [dict(zip(_LIST_BUSINESS_COLS, row)) for row in rows]
+
         return jsonify({
             'results': businesses,
             'total': len(businesses)
@@ -427,13 +595,14 @@ def change_password():
         if not current_password or not new_password:
             return jsonify({'error': 'Current password and new password required'}), 400
         
-        user = User.query.get(user_id)
+        user = current_user()
         if not user.check_password(current_password):
             return jsonify({'error': 'Current password is incorrect'}), 400
         
         user.set_password(new_password)
         db.session.commit()
-        
+        invalidate_user_cache()
+
         return jsonify({'success': True}), 200
         
     except Exception as e:
@@ -447,33 +616,40 @@ def export_user_data():
         if not user_id:
             return jsonify({'error': 'Authentication required'}), 401
         
-        # Get all user data
-        user = User.query.get(user_id)
-        saved_lists = SavedList.query.filter_by(user_id=user_id).all()
-        custom_lists = CustomList.query.filter_by(user_id=user_id).all()
-        list_contacts = ListContact.query.filter_by(user_id=user_id).all()
-        
-        # Prepare export data
-        export_data = {
-            'user': user.to_dict(),
-            'saved_lists': [list.to_dict() for list in saved_lists],
-            'custom_lists': [list.to_dict() for list in custom_lists],
-            'contacts': [contact.to_dict() for contact in list_contacts],
-            'export_date': datetime.utcnow().isoformat()
-        }
-        
-        # Create JSON response
-        from flask import Response
-        response = Response(
-            json.dumps(export_data, indent=2),
+        user = current_user()
+
+        # Stream the JSON out section by section instead of building the
+        # whole export dict and its serialized copy in memory; contacts
+        # (the unbounded collection) trickle through yield_per batches
+        from flask import Response, stream_with_context
+        from flask import current_app
+
+        def generate():
+            dumps = current_app.json.dumps
+            yield '{"user":' + dumps(user.to_dict())
+            yield ',"saved_lists":['
+            for i, saved_list in enumerate(
+                    SavedList.query.filter_by(user_id=user_id)):
+                yield (',' if i else '') + dumps(saved_list.to_dict())
+            yield '],"custom_lists":['
+            for i, custom_list in enumerate(
+                    CustomList.query.filter_by(user_id=user_id)):
+                yield (',' if i else '') + dumps(custom_list.to_dict())
+            yield '],"contacts":['
+            contacts = (ListContact.query.filter_by(user_id=user_id)
+                        .execution_options(stream_results=True))
+            for i, contact in enumerate(contacts.yield_per(500)):
+                yield (',' if i else '') + dumps(contact.to_dict())
+            yield '],"export_date":' + dumps(datetime.utcnow().isoformat()) + '}'
+
+        return Response(
+            stream_with_context(generate()),
             mimetype='application/json',
             headers={
                 'Content-Disposition': f'attachment; filename=lead_generator_data_{datetime.utcnow().strftime("%Y%m%d")}.json'
             }
         )
-        
-        return response
-        
+
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -486,7 +662,7 @@ def delete_user_account():
             return jsonify({'error': 'Authentication required'}), 401
         
         # Delete all user data (cascade should handle this)
-        user = User.query.get(user_id)
+        user = current_user()
         if user:
             db.session.delete(user)
             db.session.commit()
@@ -14,6 +14,7 @@ Features:
 """
 
 import os
+import subprocess
 import sys
 from typing import Optional
 from business_finder import BusinessFinder, BusinessSearchParams
@@ -28,6 +29,14 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# One helper instance for the whole CLI, and the popular-category menu
+# formatted once at import instead of per prompt
+_CATEGORY_HELPER = CategoryHelper()
+_POPULAR_CATEGORIES_MENU = "\n".join(
+    f"  {i:2d}. {category['title']}"
+    for i, category in enumerate(_CATEGORY_HELPER.get_popular_categories()[:10], 1)
+)
+
 
 def get_user_input() -> BusinessSearchParams:
     """
@@ -49,21 +58,17 @@ def get_user_input() -> BusinessSearchParams:
     
     # Get industry
     print("\n🏢 Available industries (or enter your own):")
-    category_helper = CategoryHelper()
-    popular_categories = category_helper.get_popular_categories()
-    
-    # Show popular categories
-    for i, category in enumerate(popular_categories[:10], 1):
-        print(f"  {i:2d}. {category['title']}")
-    
+    print(_POPULAR_CATEGORIES_MENU)
+    category_helper = _CATEGORY_HELPER
+
     while True:
         industry = input("\n🏢 Enter industry (e.g., 'restaurants', 'dentists', 'plumbers'): ").strip()
         if industry:
-            # Validate category if it's in our list
-            if category_helper.validate_category(industry):
-                category_info = category_helper.get_category_by_alias(industry) or category_helper.get_category_by_title(industry)
-                if category_info:
-                    print(f"✅ Using category: {category_info['title']}")
+            # One resolve() lookup replaces the validate + by-alias +
+            # by-title triple when the category is in our list
+            category_info = category_helper.resolve(industry)
+            if category_info:
+                print(f"✅ Using category: {category_info['title']}")
             break
         print("❌ Industry is required. Please try again.")
     
@@ -158,13 +163,17 @@ def main():
             # Ask if user wants to open the file
             open_file = input(f"\n📂 Open Excel file? (y/n, default y): ").strip().lower()
             if open_file not in ['n', 'no']:
+                # Popen without a shell: no fork+parse, no blocking on
+                # the viewer, and filenames with quotes stay safe
                 try:
-                    os.system(f"open '{excel_file}'")  # macOS
-                except:
-                    try:
-                        os.system(f"start '{excel_file}'")  # Windows
-                    except:
-                        print(f"Please open the file manually: {excel_file}")
+                    if sys.platform == 'darwin':
+                        subprocess.Popen(['open', excel_file])
+                    elif sys.platform.startswith('win'):
+                        os.startfile(excel_file)
+                    else:
+                        subprocess.Popen(['xdg-open', excel_file])
+                except OSError:
+                    print(f"Please open the file manually: {excel_file}")
         else:
             print("\n❌ No businesses found or error occurred.")
             print("Please check your search parameters and try again.")
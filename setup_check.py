@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Readiness probe for the Lead Generator setup
+
+Named without a test_ prefix so pytest doesn't collect it alongside
+tests/test_setup.py; run directly with `python setup_check.py` (-v for
+per-check detail).
+"""
+
+import logging
+import os
+import sys
+
+# Deferred %-style logging instead of print: nothing is formatted or
+# written unless the level is enabled, so the happy path costs no I/O
+logger = logging.getLogger(__name__)
+
+
+def check_imports():
+    """Check that all imports work correctly"""
+    # Imported here (and in the other checks) rather than at module
+    # top so one failing dependency is reported as that check failing
+    # instead of killing the whole probe at import time
+    from config import YELP_API_KEY, GOOGLE_API_KEY  # noqa: F401
+    from business_finder import BusinessFinder  # noqa: F401
+    from category_helper import CategoryHelper  # noqa: F401
+    logger.debug("all imports successful")
+
+
+def check_category_helper():
+    """Check category helper functionality"""
+    from category_helper import CategoryHelper
+
+    helper = CategoryHelper()
+    popular = helper.get_popular_categories()
+    assert isinstance(popular, list)
+    logger.debug("found %d popular categories", len(popular))
+
+    results = helper.search_categories("restaurant", limit=3)
+    assert isinstance(results, list)
+    logger.debug("found %d restaurant categories", len(results))
+
+
+def check_business_finder():
+    """Check business finder initialization"""
+    from business_finder import BusinessFinder
+
+    yelp_key = os.getenv('YELP_API_KEY')
+    google_key = os.getenv('GOOGLE_API_KEY')
+
+    if not yelp_key or not google_key:
+        logger.debug("API keys not available; skipping Business Finder init")
+        return
+
+    finder = BusinessFinder(yelp_api_key=yelp_key, google_api_key=google_key)
+    assert finder is not None
+    logger.debug("Business Finder initialized successfully")
+
+
+def check_search_params():
+    """Check the BusinessSearchParams dataclass"""
+    from business_finder import BusinessSearchParams
+
+    params = BusinessSearchParams(
+        city="San Francisco",
+        industry="restaurants",
+        distance_miles=5.0,
+        max_results=10
+    )
+    assert params.city == "San Francisco"
+    assert params.industry == "restaurants"
+
+
+def main():
+    """Run all checks; exit non-zero if any fail (readiness probe)."""
+    logging.basicConfig(
+        level=logging.DEBUG if '-v' in sys.argv[1:] else logging.INFO,
+        format='%(levelname)s %(message)s'
+    )
+
+    checks = [
+        check_imports,
+        check_category_helper,
+        check_business_finder,
+        check_search_params
+    ]
+
+    failed = 0
+    for check in checks:
+        try:
+            check()
+        except Exception:
+            logger.exception("%s failed", check.__name__)
+            failed += 1
+
+    if failed:
+        logger.error("%d/%d checks failed", failed, len(checks))
+        sys.exit(1)
+    logger.info("all %d checks passed; Lead Generator is ready to use", len(checks))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,121 +3,227 @@ Smarty Streets Address Verification Service
 """
 
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Base confidence by DPV match code, frozen like the other module
+# constants so nothing can mutate the shared table
+_DPV_CONFIDENCE = MappingProxyType({
+    'Y': 1.0,  # Confirmed deliverable
+    'S': 0.9,  # Confirmed deliverable (secondary address)
+    'D': 0.8,  # Confirmed deliverable (business)
+    'N': 0.0,  # Not deliverable
+})
+# Combined (dpv_vacant, dpv_cmra) adjustment: 0.7 for vacant, 0.9 for
+# commercial mail receiving agency, multiplied when both apply
+_DPV_ADJUSTMENT = MappingProxyType({
+    (False, False): 1.0,
+    (True, False): 0.7,
+    (False, True): 0.9,
+    (True, True): 0.63,
+})
+
+# Frozen template for unverified/invalid/errored results: dict(template)
+# is one C-level copy instead of rebuilding the 8-key literal per failure
+_FAIL_TEMPLATE = MappingProxyType({
+    'verified': False,
+    'status': 'invalid',
+    'confidence': 0.0,
+    'verified_address': None,
+    'verified_city': None,
+    'verified_state': None,
+    'verified_zip_code': None,
+    'error': None
+})
+
 class SmartyStreetsVerifier:
     """Address verification using Smarty Streets API"""
-    
-    def __init__(self, auth_id: str, auth_token: str):
+
+    # The /verify endpoint accepts up to 100 candidates per JSON POST
+    BULK_CHUNK_SIZE = 100
+    # Verified addresses don't churn; a week of reuse saves quota and
+    # latency on duplicate-heavy lead lists and pipeline re-runs
+    CACHE_TTL = 604800
+    CACHE_MAX_SIZE = 50000
+
+
+    def __init__(self, auth_id: str, auth_token: str, max_workers: int = 10):
         """
         Initialize Smarty Streets verifier
-        
+
         Args:
             auth_id: Smarty Streets Auth ID
             auth_token: Smarty Streets Auth Token
+            max_workers: Concurrent requests for batch verification
+                (default respects Smarty's concurrency limits)
         """
         self.auth_id = auth_id
         self.auth_token = auth_token
+        self.max_workers = max_workers
+        # Results cached by normalized address key with an expiry stamp
+        self._cache = {}
         self.base_url = "https://us-street.api.smartystreets.com/verify"
-    
+        # Persistent session: keep-alive reuses one TCP/TLS connection
+        # across calls instead of paying DNS + handshake per address,
+        # and the adapter pool lets concurrent threads share sockets
+        self.session = requests.Session()
+        self.session.params = {
+            'auth-id': self.auth_id,
+            'auth-token': self.auth_token
+        }
+        self.session.mount('https://',
+                           HTTPAdapter(pool_connections=1, pool_maxsize=32))
+
+    def close(self):
+        """Release the pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
     def verify_address(self, street: str, city: str, state: str, zip_code: str) -> Dict:
         """
         Verify a single address using Smarty Streets
-        
+
         Args:
             street: Street address
             city: City name
             state: State abbreviation
             zip_code: ZIP code
-            
+
         Returns:
             Dictionary with verification results
         """
-        try:
-            params = {
-                'auth-id': self.auth_id,
-                'auth-token': self.auth_token,
-                'street': street,
-                'city': city,
-                'state': state,
-                'zipcode': zip_code
+        # Thin wrapper over the bulk path so single and batch
+        # verification share one request format, result handling, and
+        # the response cache
+        return self.batch_verify_addresses([{
+            'street': street,
+            'city': city,
+            'state': state,
+            'zip_code': zip_code
+        }])[0]
+
+    @staticmethod
+    def _cache_key(address: Dict) -> Tuple:
+        """Normalized cache key for one address dict."""
+        return (address.get('street', '').strip().lower(),
+                address.get('city', '').strip().lower(),
+                address.get('state', '').strip().upper(),
+                address.get('zip_code', '').strip())
+
+    def _cache_get(self, key: Tuple) -> Optional[Dict]:
+        """Return the cached result for key if present and fresh."""
+        hit = self._cache.get(key)
+        if hit is not None and hit[0] > time.time():
+            return hit[1]
+        return None
+
+    def _cache_put(self, key: Tuple, result: Dict):
+        """Cache a result unless it was an API error (those retry)."""
+        if result.get('status') == 'error':
+            return
+        if len(self._cache) >= self.CACHE_MAX_SIZE:
+            self._cache.clear()
+        self._cache[key] = (time.time() + self.CACHE_TTL, result)
+
+    @staticmethod
+    def _failure_result(status: str, error: str) -> Dict:
+        """Result dict for an unverified, invalid, or errored address."""
+        result = dict(_FAIL_TEMPLATE)
+        result['status'] = status
+        result['error'] = error
+        return result
+
+    def _interpret_result(self, result: Dict) -> Dict:
+        """Turn one Smarty candidate into a verification result dict."""
+        if result.get('analysis', {}).get('dpv_match_code') in ['Y', 'S', 'D']:
+            # Address is deliverable
+            return {
+                'verified': True,
+                'status': 'verified',
+                'confidence': self._calculate_confidence(result),
+                'verified_address': result.get('delivery_line_1', ''),
+                'verified_city': result.get('components', {}).get('city_name', ''),
+                'verified_state': result.get('components', {}).get('state_abbreviation', ''),
+                'verified_zip_code': result.get('components', {}).get('zipcode', ''),
+                'error': None
             }
-            
-            response = requests.get(self.base_url, params=params)
+        # Address is not deliverable
+        return self._failure_result(
+            'invalid',
+            result.get('analysis', {}).get('dpv_footnotes', 'Address not deliverable')
+        )
+
+    def _verify_chunk(self, addresses: list) -> list:
+        """
+        Verify up to BULK_CHUNK_SIZE addresses with one JSON POST.
+
+        Smarty tags each returned candidate with input_index and omits
+        addresses it found no match for, so results are re-scattered to
+        input positions with 'invalid' filling the gaps.
+
+        Args:
+            addresses: List of address dicts (street, city, state, zip_code)
+
+        Returns:
+            List of verification results, in input order
+        """
+        payload = [{
+            'street': address.get('street', ''),
+            'city': address.get('city', ''),
+            'state': address.get('state', ''),
+            'zipcode': address.get('zip_code', ''),
+            'input_id': str(i)
+        } for i, address in enumerate(addresses)]
+
+        try:
+            # Auth lives in session.params; the timeout bounds connect
+            # and read separately so a stalled call can't hang a worker
+            response = self.session.post(self.base_url, json=payload,
+                                         timeout=(3.05, 30))
             response.raise_for_status()
-            
-            results = response.json()
-            
-            if not results:
-                return {
-                    'verified': False,
-                    'status': 'invalid',
-                    'confidence': 0.0,
-                    'verified_address': None,
-                    'verified_city': None,
-                    'verified_state': None,
-                    'verified_zip_code': None,
-                    'error': 'No results returned'
-                }
-            
-            # Get the first result
-            result = results[0]
-            
-            # Check if address was verified
-            if result.get('analysis', {}).get('dpv_match_code') in ['Y', 'S', 'D']:
-                # Address is deliverable
-                return {
-                    'verified': True,
-                    'status': 'verified',
-                    'confidence': self._calculate_confidence(result),
-                    'verified_address': result.get('delivery_line_1', ''),
-                    'verified_city': result.get('components', {}).get('city_name', ''),
-                    'verified_state': result.get('components', {}).get('state_abbreviation', ''),
-                    'verified_zip_code': result.get('components', {}).get('zipcode', ''),
-                    'error': None
-                }
+            # orjson decodes the response noticeably faster than the
+            # stdlib parser behind response.json()
+            if orjson is not None:
+                results = orjson.loads(response.content)
             else:
-                # Address is not deliverable
-                return {
-                    'verified': False,
-                    'status': 'invalid',
-                    'confidence': 0.0,
-                    'verified_address': None,
-                    'verified_city': None,
-                    'verified_state': None,
-                    'verified_zip_code': None,
-                    'error': result.get('analysis', {}).get('dpv_footnotes', 'Address not deliverable')
-                }
-                
+                results = response.json()
         except requests.exceptions.RequestException as e:
             logger.error(f"Smarty Streets API error: {e}")
-            return {
-                'verified': False,
-                'status': 'error',
-                'confidence': 0.0,
-                'verified_address': None,
-                'verified_city': None,
-                'verified_state': None,
-                'verified_zip_code': None,
-                'error': f'API Error: {str(e)}'
-            }
+            return [self._failure_result('error', f'API Error: {str(e)}')
+                    for _ in addresses]
         except Exception as e:
             logger.error(f"Unexpected error in address verification: {e}")
-            return {
-                'verified': False,
-                'status': 'error',
-                'confidence': 0.0,
-                'verified_address': None,
-                'verified_city': None,
-                'verified_state': None,
-                'verified_zip_code': None,
-                'error': f'Unexpected error: {str(e)}'
-            }
-    
+            return [self._failure_result('error', f'Unexpected error: {str(e)}')
+                    for _ in addresses]
+
+        out = [self._failure_result('invalid', 'No results returned')
+               for _ in addresses]
+        for result in results:
+            index = result.get('input_index')
+            if index is not None and 0 <= index < len(out):
+                out[index] = self._interpret_result(result)
+        return out
+
+
     def _calculate_confidence(self, result: Dict) -> float:
         """
         Calculate confidence score based on verification result
@@ -129,26 +235,15 @@ class SmartyStreetsVerifier:
             Confidence score between 0.0 and 1.0
         """
         analysis = result.get('analysis', {})
-        dpv_match = analysis.get('dpv_match_code', 'N')
-        
-        # Base confidence on DPV match code
-        confidence_map = {
-            'Y': 1.0,  # Confirmed deliverable
-            'S': 0.9,  # Confirmed deliverable (secondary address)
-            'D': 0.8,  # Confirmed deliverable (business)
-            'N': 0.0,  # Not deliverable
-        }
-        
-        base_confidence = confidence_map.get(dpv_match, 0.0)
-        
-        # Adjust based on other factors
-        if analysis.get('dpv_vacant', False):
-            base_confidence *= 0.7  # Reduce confidence for vacant addresses
-        
-        if analysis.get('dpv_cmra', False):
-            base_confidence *= 0.9  # Slight reduction for commercial mail receiving agency
-        
-        return min(max(base_confidence, 0.0), 1.0)
+
+        # Two table lookups replace the per-call map build, the factor
+        # branches, and the clamp: every entry is in [0, 1], so the
+        # product is too
+        base_confidence = _DPV_CONFIDENCE.get(
+            analysis.get('dpv_match_code', 'N'), 0.0)
+        adjustment = _DPV_ADJUSTMENT[(bool(analysis.get('dpv_vacant')),
+                                      bool(analysis.get('dpv_cmra')))]
+        return base_confidence * adjustment
     
     def batch_verify_addresses(self, addresses: list) -> list:
         """
@@ -158,20 +253,50 @@ class SmartyStreetsVerifier:
             addresses: List of address dictionaries with keys: street, city, state, zip_code
             
         Returns:
-            List of verification results
+            List of verification results, in input order
         """
-        results = []
-        for address in addresses:
-            result = self.verify_address(
-                address.get('street', ''),
-                address.get('city', ''),
-                address.get('state', ''),
-                address.get('zip_code', '')
-            )
-            results.append(result)
-        
+        if not addresses:
+            return []
+
+        # Serve fresh cache hits directly and send only the misses to
+        # the API, then scatter the new results back into place
+        keys = [self._cache_key(address) for address in addresses]
+        results = [self._cache_get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+
+        # Duplicate addresses within the batch collapse to one API call
+        # each; results fan back out to every occurrence
+        unique = {}
+        for i in misses:
+            unique.setdefault(keys[i], i)
+
+        verified_by_key = dict(zip(
+            unique,
+            self._verify_all([addresses[i] for i in unique.values()])
+        ))
+        for key, result in verified_by_key.items():
+            self._cache_put(key, result)
+        for i in misses:
+            results[i] = verified_by_key[keys[i]]
         return results
 
+    def _verify_all(self, addresses: list) -> list:
+        """Verify addresses through the bulk endpoint, in input order."""
+        if not addresses:
+            return []
+
+        # The bulk endpoint collapses N single requests into
+        # ceil(N / 100) POSTs; the chunks are independent network I/O,
+        # so they still run concurrently over the pooled session
+        chunks = [addresses[i:i + self.BULK_CHUNK_SIZE]
+                  for i in range(0, len(addresses), self.BULK_CHUNK_SIZE)]
+        if len(chunks) == 1:
+            return self._verify_chunk(chunks[0])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return [result for chunk_results in executor.map(self._verify_chunk, chunks)
+                    for result in chunk_results]
+
 def get_smarty_verifier() -> Optional[SmartyStreetsVerifier]:
     """
     Get Smarty Streets verifier instance if credentials are available
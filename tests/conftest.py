@@ -0,0 +1,25 @@
+"""
+Shared fixtures for the Lead Generator test suite
+"""
+
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def flask_app():
+    """The Flask application, imported once for the whole session."""
+    from leadgen import app
+    return app
+
+
+@pytest.fixture(scope="session")
+def category_helper():
+    """A shared CategoryHelper (indexes are cached at class level)."""
+    from category_helper import CategoryHelper
+    return CategoryHelper()
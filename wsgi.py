@@ -0,0 +1,19 @@
+"""
+WSGI/ASGI entry points for Lead Generator
+
+Serve with a multi-worker WSGI server (e.g. `gunicorn wsgi:application`)
+so export generation and downloads don't block each other. When asgiref
+is installed, `asgi_application` wraps the same app for ASGI servers
+(e.g. `uvicorn wsgi:asgi_application`), which interleave the blocking
+handlers across a thread pool.
+"""
+
+from leadgen import app
+
+application = app
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    asgi_application = WsgiToAsgi(application)
+except ImportError:
+    asgi_application = None
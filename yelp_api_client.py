@@ -3,13 +3,85 @@ Yelp API Client for Lead Generator
 Handles Yelp Fusion API interactions
 """
 
+import asyncio
+import json
 import requests
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from requests.adapters import HTTPAdapter, Retry
 from typing import List, Dict, Optional
 from config import YELP_API_KEY, DEFAULT_LIMIT, MAX_RESULTS, BUSINESS_CATEGORIES
+from http_utils import TokenBucket, get_http_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+@dataclass(slots=True)
+class YelpBusiness:
+    """One processed Yelp search result.
+
+    Slots cut the per-record footprint versus a 17-key dict, which adds
+    up over thousands of results held between search and upsert, and
+    the fixed field order makes columnar conversion trivial.
+    """
+    yelp_id: Optional[str]
+    name: Optional[str]
+    address: str
+    city: Optional[str]
+    state: Optional[str]
+    zip_code: Optional[str]
+    phone: Optional[str]
+    website: Optional[str]
+    business_type: str
+    rating: Optional[float]
+    review_count: Optional[int]
+    price_level: Optional[str]
+    yelp_url: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    image_url: Optional[str]
+    is_closed: bool = False
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary (for jsonify and the DB upsert path)."""
+        return {name: getattr(self, name) for name in _YELP_BUSINESS_FIELDS}
+
+    @staticmethod
+    def many_to_arrow(records: List['YelpBusiness']):
+        """Materialize records as a columnar pyarrow.Table.
+
+        One typed array per field (AoS records to SoA columns), so
+        analytics callers skip per-row dict walks entirely. Requires
+        pyarrow, which stays an optional dependency.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for many_to_arrow")
+        return pa.table({name: [getattr(record, name) for record in records]
+                         for name in _YELP_BUSINESS_FIELDS})
+
+
+_YELP_BUSINESS_FIELDS = tuple(field.name for field in fields(YelpBusiness))
+
 
 class YelpAPIClient:
+    # Yelp's documented QPS cap; the bucket throttles concurrent page
+    # fetches to it client-side so the retry policy stays a backstop
+    YELP_QPS = 5
+
     def __init__(self):
         self.api_key = YELP_API_KEY
         self.base_url = "https://api.yelp.com/v3"
@@ -18,111 +90,150 @@ class YelpAPIClient:
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         })
-        self.rate_limit_delay = 0.1  # 100ms between requests
-    
-    def search_businesses(self, location: str, business_type: str = None, 
-                         radius: int = 25000, max_results: int = 100) -> List[Dict]:
+        # Transient 429/5xx responses retry with backoff (honouring
+        # Retry-After) instead of silently terminating pagination early
+        retries = Retry(total=5, backoff_factor=0.3,
+                        status_forcelist=[429, 500, 502, 503, 504],
+                        allowed_methods=('GET',),
+                        respect_retry_after_header=True)
+        # Sized pools so concurrent page fetches keep their keep-alive
+        # connections instead of discarding everything past urllib3's
+        # default of 10
+        self.session.mount('https://',
+                           HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                                       max_retries=retries))
+        # Adaptive throttle: requests only wait when the bucket is
+        # empty, instead of a fixed 100 ms pessimistic sleep per page
+        self._yelp_bucket = TokenBucket(rate=self.YELP_QPS,
+                                        capacity=self.YELP_QPS)
+
+    def _get(self, path: str, params: Optional[Dict] = None,
+             bypass_cache: bool = False) -> Optional[Dict]:
+        """GET one Yelp endpoint and decode the JSON response.
+
+        Shared by every request path so retry, timeout, decode, caching,
+        and error handling live in one place. Responses are served from
+        the shared on-disk cache within its TTL — identical searches and
+        detail lookups don't re-spend a paid API call — unless
+        bypass_cache forces a refresh. Returns None on failure.
+        """
+        url = f"{self.base_url}/{path}"
+        cache = get_http_cache()
+        cache_key = cache.key(url, params or {})
+        if not bypass_cache:
+            body = cache.get(cache_key)
+            if body is not None:
+                return orjson.loads(body) if orjson is not None else json.loads(body)
+
+        try:
+            self._yelp_bucket.acquire()
+            response = self.session.get(url, params=params, timeout=(3.05, 10))
+            response.raise_for_status()
+            cache.put(cache_key, response.content)
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"API request failed: {e}")
+            return None
+
+    def search_businesses(self, location: str, business_type: str = None,
+                         radius: int = 25000, max_results: int = 100,
+                         bypass_cache: bool = False) -> List[YelpBusiness]:
         """Search for businesses using Yelp Fusion API"""
         if not self.api_key:
             raise ValueError("Yelp API key is required")
-        
-        businesses = []
-        offset = 0
-        limit = min(DEFAULT_LIMIT, max_results)
-        
-        while len(businesses) < max_results:
-            # Calculate how many results to fetch
-            remaining = max_results - len(businesses)
-            current_limit = min(limit, remaining)
-            
-            try:
-                # Make API request
-                response = self._make_search_request(
-                    location, business_type, radius, current_limit, offset
-                )
-                
-                if not response:
-                    break
-                
-                # Process results
-                for business in response.get('businesses', []):
-                    if len(businesses) >= max_results:
-                        break
-                    
-                    processed_business = self._process_business(business)
-                    businesses.append(processed_business)
-                
-                # Check if we have more results
-                if len(response.get('businesses', [])) < current_limit:
-                    break
-                
-                offset += current_limit
-                time.sleep(self.rate_limit_delay)
-                
-            except Exception as e:
-                print(f"Error fetching businesses: {e}")
-                break
-        
-        return businesses[:max_results]
-    
-    def _make_search_request(self, location: str, business_type: str = None, 
-                           radius: int = 25000, limit: int = 50, offset: int = 0) -> Dict:
-        """Make a search request to Yelp API"""
-        url = f"{self.base_url}/businesses/search"
-        
+
         params = {
             'location': location,
             'radius': radius,
-            'limit': limit,
-            'offset': offset,
             'sort_by': 'best_match'
         }
-        
+
         if business_type:
             params['categories'] = business_type
-        
-        try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API request failed: {e}")
-            return None
-    
-    def _process_business(self, business: Dict) -> Dict:
+
+        return self._paginated_search(params, max_results, bypass_cache)
+
+    def _paginated_search(self, params: Dict, max_results: int,
+                          bypass_cache: bool = False) -> List[YelpBusiness]:
+        """Fetch and process a paginated search with concurrent pages.
+
+        The first page is fetched synchronously to learn the result
+        total; the remaining offsets are independent I/O, so they fetch
+        in parallel and the paginated portion costs roughly one
+        round-trip instead of one per page. executor.map preserves
+        offset order, so results come back in Yelp's ranking.
+        """
+        if max_results <= 0:
+            return []
+
+        limit = min(DEFAULT_LIMIT, max_results)
+        first = self._get('businesses/search',
+                          {**params, 'limit': limit, 'offset': 0},
+                          bypass_cache)
+        if not first:
+            return []
+
+        page = first.get('businesses', ())
+        total = min(max_results, first.get('total', len(page)))
+        businesses = [self._process_business(business)
+                      for business in page[:total]]
+
+        # A short first page means end of results
+        if len(page) < limit or len(businesses) >= total:
+            return businesses
+
+        def fetch_page(offset: int) -> tuple:
+            data = self._get('businesses/search',
+                             {**params,
+                              'limit': min(limit, total - offset),
+                              'offset': offset},
+                             bypass_cache)
+            return data.get('businesses', ()) if data else ()
+
+        offsets = range(limit, total, limit)
+        # max_workers matches Yelp's 5 QPS cap so the burst of page
+        # fetches stays inside the rate limit
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            for page in executor.map(fetch_page, offsets):
+                businesses.extend(self._process_business(business)
+                                  for business in page)
+
+        return businesses[:total]
+
+    def _process_business(self, business: Dict) -> YelpBusiness:
         """Process a business from Yelp API response"""
         location = business.get('location', {})
         coordinates = business.get('coordinates', {})
-        
-        return {
-            'yelp_id': business.get('id'),
-            'name': business.get('name'),
-            'address': self._format_address(location),
-            'city': location.get('city'),
-            'state': location.get('state'),
-            'zip_code': location.get('zip_code'),
-            'phone': business.get('phone'),
-            'website': business.get('url'),
-            'business_type': self._get_primary_category(business.get('categories', [])),
-            'rating': business.get('rating'),
-            'review_count': business.get('review_count'),
-            'price_level': business.get('price'),
-            'yelp_url': business.get('url'),
-            'latitude': coordinates.get('latitude'),
-            'longitude': coordinates.get('longitude'),
-            'image_url': business.get('image_url'),
-            'is_closed': business.get('is_closed', False)
-        }
+
+        return YelpBusiness(
+            yelp_id=business.get('id'),
+            name=business.get('name'),
+            address=self._format_address(location),
+            city=location.get('city'),
+            state=location.get('state'),
+            zip_code=location.get('zip_code'),
+            phone=business.get('phone'),
+            website=business.get('url'),
+            business_type=self._get_primary_category(business.get('categories', [])),
+            rating=business.get('rating'),
+            review_count=business.get('review_count'),
+            price_level=business.get('price'),
+            yelp_url=business.get('url'),
+            latitude=coordinates.get('latitude'),
+            longitude=coordinates.get('longitude'),
+            image_url=business.get('image_url'),
+            is_closed=business.get('is_closed', False)
+        )
     
     def _format_address(self, location: Dict) -> str:
         """Format address from location data"""
-        address_parts = []
-        
-        for field in ['address1', 'address2', 'address3']:
-            if location.get(field):
-                address_parts.append(location[field])
-        
-        return ', '.join(address_parts)
+        # One probe per key feeding join directly — no loop bookkeeping
+        # or append dispatch per record
+        return ', '.join(part for part in (location.get('address1'),
+                                           location.get('address2'),
+                                           location.get('address3')) if part)
     
     def _get_primary_category(self, categories: List[Dict]) -> str:
         """Get primary business category"""
@@ -132,70 +243,195 @@ class YelpAPIClient:
         # Return the first category's alias
         return categories[0].get('alias', 'other')
     
-    def get_business_details(self, business_id: str) -> Optional[Dict]:
+    def get_business_details(self, business_id: str,
+                             bypass_cache: bool = False) -> Optional[YelpBusiness]:
         """Get detailed business information"""
         if not self.api_key:
             raise ValueError("Yelp API key is required")
-        
-        url = f"{self.base_url}/businesses/{business_id}"
-        
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            business = response.json()
-            return self._process_business(business)
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to get business details: {e}")
+
+        business = self._get(f'businesses/{business_id}',
+                             bypass_cache=bypass_cache)
+        if business is None:
             return None
+        return self._process_business(business)
     
-    def search_businesses_by_coordinates(self, latitude: float, longitude: float, 
-                                       business_type: str = None, radius: int = 25000, 
-                                       max_results: int = 100) -> List[Dict]:
+    def search_businesses_by_coordinates(self, latitude: float, longitude: float,
+                                       business_type: str = None, radius: int = 25000,
+                                       max_results: int = 100,
+                                       bypass_cache: bool = False) -> List[YelpBusiness]:
         """Search for businesses by coordinates"""
         if not self.api_key:
             raise ValueError("Yelp API key is required")
-        
-        businesses = []
-        offset = 0
+
+        params = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'radius': radius,
+            'sort_by': 'best_match'
+        }
+
+        if business_type:
+            params['categories'] = business_type
+
+        return self._paginated_search(params, max_results, bypass_cache)
+
+
+class AsyncYelpAPIClient:
+    """Asyncio variant of YelpAPIClient for many concurrent searches.
+
+    With aiohttp installed, all page offsets fetch as coroutines on one
+    connection pool (DNS cached, concurrency gated to the QPS cap), so
+    hundreds of in-flight searches cost a single thread. Without it,
+    each call runs the sync client on a worker thread, keeping the
+    event loop unblocked. Both paths share the sync client's on-disk
+    response cache and result processing.
+    """
+
+    def __init__(self):
+        self._sync = YelpAPIClient()
+        self.api_key = self._sync.api_key
+        self.base_url = self._sync.base_url
+
+    async def search_businesses(self, location: str, business_type: str = None,
+                                radius: int = 25000, max_results: int = 100,
+                                bypass_cache: bool = False) -> List[YelpBusiness]:
+        """Async equivalent of YelpAPIClient.search_businesses"""
+        if aiohttp is None:
+            return await asyncio.to_thread(
+                self._sync.search_businesses, location, business_type,
+                radius, max_results, bypass_cache)
+
+        if not self.api_key:
+            raise ValueError("Yelp API key is required")
+
+        params = {
+            'location': location,
+            'radius': radius,
+            'sort_by': 'best_match'
+        }
+
+        if business_type:
+            params['categories'] = business_type
+
+        return await self._paginated_search(params, max_results, bypass_cache)
+
+    async def search_businesses_by_coordinates(self, latitude: float, longitude: float,
+                                               business_type: str = None, radius: int = 25000,
+                                               max_results: int = 100,
+                                               bypass_cache: bool = False) -> List[YelpBusiness]:
+        """Async equivalent of YelpAPIClient.search_businesses_by_coordinates"""
+        if aiohttp is None:
+            return await asyncio.to_thread(
+                self._sync.search_businesses_by_coordinates, latitude,
+                longitude, business_type, radius, max_results, bypass_cache)
+
+        if not self.api_key:
+            raise ValueError("Yelp API key is required")
+
+        params = {
+            # aiohttp rejects float query values, so coordinates travel
+            # as strings
+            'latitude': str(latitude),
+            'longitude': str(longitude),
+            'radius': radius,
+            'sort_by': 'best_match'
+        }
+
+        if business_type:
+            params['categories'] = business_type
+
+        return await self._paginated_search(params, max_results, bypass_cache)
+
+    async def get_business_details(self, business_id: str,
+                                   bypass_cache: bool = False) -> Optional[YelpBusiness]:
+        """Async equivalent of YelpAPIClient.get_business_details"""
+        if aiohttp is None:
+            return await asyncio.to_thread(
+                self._sync.get_business_details, business_id, bypass_cache)
+
+        if not self.api_key:
+            raise ValueError("Yelp API key is required")
+
+        async with self._session() as session:
+            business = await self._fetch(session, asyncio.Semaphore(1),
+                                         f'businesses/{business_id}', {},
+                                         bypass_cache)
+        if business is None:
+            return None
+        return self._sync._process_business(business)
+
+    def _session(self) -> 'aiohttp.ClientSession':
+        """New client session on the current event loop."""
+        return aiohttp.ClientSession(
+            headers={'Authorization': f'Bearer {self.api_key}'},
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+        )
+
+    async def _fetch(self, session, semaphore, path: str, params: Dict,
+                     bypass_cache: bool) -> Optional[Dict]:
+        """Async counterpart of YelpAPIClient._get, sharing its cache."""
+        url = f"{self.base_url}/{path}"
+        cache = get_http_cache()
+        cache_key = cache.key(url, params)
+        if not bypass_cache:
+            body = cache.get(cache_key)
+            if body is not None:
+                return orjson.loads(body) if orjson is not None else json.loads(body)
+
+        try:
+            async with semaphore:
+                async with session.get(url, params=params) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+        except aiohttp.ClientError as e:
+            print(f"API request failed: {e}")
+            return None
+
+        cache.put(cache_key, body)
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+
+    async def _paginated_search(self, params: Dict, max_results: int,
+                                bypass_cache: bool) -> List[YelpBusiness]:
+        """Concurrent pagination on coroutines instead of threads.
+
+        Same shape as the sync client's _paginated_search: the first
+        page reveals the total, the remaining offsets fetch via
+        asyncio.gather with a semaphore holding concurrency to the QPS
+        cap, and gather preserves offset order.
+        """
+        if max_results <= 0:
+            return []
+
         limit = min(DEFAULT_LIMIT, max_results)
-        
-        while len(businesses) < max_results:
-            remaining = max_results - len(businesses)
-            current_limit = min(limit, remaining)
-            
-            try:
-                url = f"{self.base_url}/businesses/search"
-                params = {
-                    'latitude': latitude,
-                    'longitude': longitude,
-                    'radius': radius,
-                    'limit': current_limit,
-                    'offset': offset,
-                    'sort_by': 'best_match'
-                }
-                
-                if business_type:
-                    params['categories'] = business_type
-                
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                for business in data.get('businesses', []):
-                    if len(businesses) >= max_results:
-                        break
-                    
-                    processed_business = self._process_business(business)
-                    businesses.append(processed_business)
-                
-                if len(data.get('businesses', [])) < current_limit:
-                    break
-                
-                offset += current_limit
-                time.sleep(self.rate_limit_delay)
-                
-            except Exception as e:
-                print(f"Error searching by coordinates: {e}")
-                break
-        
-        return businesses[:max_results]
+        semaphore = asyncio.Semaphore(YelpAPIClient.YELP_QPS)
+
+        async with self._session() as session:
+            first = await self._fetch(session, semaphore, 'businesses/search',
+                                      {**params, 'limit': limit, 'offset': 0},
+                                      bypass_cache)
+            if not first:
+                return []
+
+            page = first.get('businesses', ())
+            total = min(max_results, first.get('total', len(page)))
+            businesses = [self._sync._process_business(business)
+                          for business in page[:total]]
+
+            # A short first page means end of results
+            if len(page) < limit or len(businesses) >= total:
+                return businesses
+
+            pages = await asyncio.gather(
+                *(self._fetch(session, semaphore, 'businesses/search',
+                              {**params,
+                               'limit': min(limit, total - offset),
+                               'offset': offset},
+                              bypass_cache)
+                  for offset in range(limit, total, limit)))
+
+        for data in pages:
+            if data:
+                businesses.extend(self._sync._process_business(business)
+                                  for business in data.get('businesses', ()))
+
+        return businesses[:total]